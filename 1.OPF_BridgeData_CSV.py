@@ -1,11 +1,15 @@
 import pandas as pd
 import requests
 import time
+import os
+from opf_planner import registry   # CSV 인코딩 처리 + 교량 목록 바이너리 스냅샷
 
 # ======================================================
 # 1. 사용자 설정 (API 키 입력)
 # ======================================================
 REST_API_KEY = ""        # 발급 받은 REST API 키 입력
+# API 주소 (로컬 모의 서버 5.OPF_Mock_Kakao.py로 바꿀 때: 환경변수 OPF_KAKAO_LOCAL_URL)
+KAKAO_LOCAL_API_URL = os.environ.get("OPF_KAKAO_LOCAL_URL", "https://dapi.kakao.com")
 
 # ======================================================
 # 2. 파일 불러오기
@@ -14,18 +18,12 @@ input_file = ""        # 생성한 입력 데이터 csv 파일 이름 (예: Targ
 output_file = ""        # 최종 입력 데이터 csv 파일 이름 (예: Final_Bridge_Data.csv)
 
 try:
-    # [수정] encoding='cp949' 추가 (한글 깨짐 해결)
-    # 엑셀에서 만든 CSV는 대부분 cp949로 읽어야 합니다.
-    df = pd.read_csv(input_file, usecols=['ID', 'name', 'address'], encoding='cp949')
+    # 엑셀에서 만든 CSV(cp949)와 utf-8(-sig) CSV 모두 읽기 (세 스크립트 공통 인코딩 처리)
+    df = registry.read_csv(input_file, usecols=['ID', 'name', 'address'])
     print(f"📂 '{input_file}' 로드 완료! (총 {len(df)}개 교량)")
-except UnicodeDecodeError:
-    # 혹시 cp949로도 안 되면 utf-8-sig로 재시도
-    try:
-        df = pd.read_csv(input_file, usecols=['ID', 'name', 'address'], encoding='utf-8-sig')
-        print(f"📂 '{input_file}' 로드 완료! (utf-8-sig)")
-    except Exception as e:
-        print(f"❌ 인코딩 오류 2차 실패: {e}")
-        exit()
+except UnicodeDecodeError as e:
+    print(f"❌ 인코딩 오류: {e}")
+    exit()
 except Exception as e:
     print(f"❌ 파일 읽기 실패: {e}")
     exit()
@@ -34,7 +32,7 @@ except Exception as e:
 # 3. 카카오 API 좌표 변환 함수
 # ======================================================
 def get_lat_lon(address, api_key):
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+    url = f"{KAKAO_LOCAL_API_URL}/v2/local/search/address.json"
     headers = {"Authorization": f"KakaoAK {api_key}"}
     
     try:
@@ -47,7 +45,7 @@ def get_lat_lon(address, api_key):
             return float(y), float(x)
         else:
             # 주소 검색 실패 시 키워드 검색 시도
-            url_keyword = "https://dapi.kakao.com/v2/local/search/keyword.json"
+            url_keyword = f"{KAKAO_LOCAL_API_URL}/v2/local/search/keyword.json"
             response = requests.get(url_keyword, headers=headers, params={"query": address})
             data = response.json()
             if data.get('documents'):
@@ -105,6 +103,8 @@ df['inspection_time'] = ""
 
 # 저장할 때는 전세계 공통인 utf-8-sig로 저장
 df.to_csv(output_file, index=False, encoding="utf-8-sig")
+# 바이너리 스냅샷도 함께 생성 (기존 파일을 다시 만든 경우 좌표가 그대로인 교량은 버전 유지)
+registry.load(output_file)
 
 print("\n" + "="*50)
 print(f"🎉 작업 완료! '{output_file}' 파일이 생성되었습니다.")
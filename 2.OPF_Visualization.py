@@ -4,6 +4,7 @@ import os
 import shutil
 import webbrowser  # 브라우저 실행을 위한 모듈 추가
 from threading import Timer
+from opf_planner import registry   # 교량 목록 바이너리 스냅샷 (CSV 옆 <csv>.registry.npy)
 
 # ======================================================
 # 1. 사용자 설정
@@ -24,12 +25,10 @@ if os.path.exists(csv_file_path):
         shutil.copy(csv_file_path, backup_file_path)
 
 def load_data():
-    if not os.path.exists(csv_file_path): return None
-    try:
-        df = pd.read_csv(csv_file_path, encoding='utf-8-sig')
-    except:
-        try: df = pd.read_csv(csv_file_path, encoding='cp949')
-        except: return None
+    # 스냅샷을 메모리 맵으로 읽어 화면을 열 때마다 CSV를 다시 파싱하지 않음
+    reg = registry.load(csv_file_path)
+    if reg is None: return None
+    df = reg.frame()
     df = df.dropna(subset=['latitude', 'longitude'])
     return df
 
@@ -185,13 +184,10 @@ def update_location():
         target_id = str(data['id'])
         new_lat = float(data['latitude'])
         new_lng = float(data['longitude'])
-        df = load_data()
-        df['ID'] = df['ID'].astype(str)
-        if target_id in df['ID'].values:
-            idx = df[df['ID'] == target_id].index[0]
-            df.at[idx, 'latitude'] = new_lat
-            df.at[idx, 'longitude'] = new_lng
-            df.to_csv(csv_file_path, index=False, encoding='utf-8-sig')
+        # 해당 교량 행만 수정하고 그 교량의 좌표 버전을 올림 → 경로 최적화 쪽 캐시는 이 교량 것만 무효화됨
+        reg = registry.load(csv_file_path)
+        if reg is None: return jsonify({"status": "error", "message": "CSV not found"})
+        if reg.update_location(target_id, new_lat, new_lng):
             return jsonify({"status": "success"})
         return jsonify({"status": "error", "message": "ID not found"})
     except Exception as e:
@@ -1,24 +1,34 @@
-import pandas as pd
-import requests
+# pandas / requests / http.server / concurrent.futures 등 무거운 모듈은 사용하는 함수 안에서 import (시작 시간 단축)
 import datetime
 import sys
 import os
 import json
-import http.server
-import socketserver
-import webbrowser
+import argparse
+import contextlib
+import io
 import threading
-import concurrent.futures
+import queue
+import uuid
 import math
 import random
 import itertools
 import time
+import functools
+import hashlib
+import re
+import abc
 
 # ==========================================
 # 1. 설정 및 초기화
 # ==========================================
 KAKAO_REST_KEY = ""        # 발급 받은 REST API 키 입력
 KAKAO_JS_KEY = ""        # 발급 받은 JavsScript 키 입력
+# API 주소 (로컬 모의 서버 5.OPF_Mock_Kakao.py 등으로 바꿀 때: 환경변수 또는 --api-base)
+KAKAO_LOCAL_API_URL = os.environ.get("OPF_KAKAO_LOCAL_URL", "https://dapi.kakao.com")
+KAKAO_NAVI_API_URL = os.environ.get("OPF_KAKAO_NAVI_URL", "https://apis-navi.kakaomobility.com")
+API_TIMEOUT = 10          # API 요청 제한 시간 (초)
+API_MAX_RETRIES = 3       # 429(요청 한도 초과) 응답 시 재시도 횟수
+API_RETRY_BACKOFF = 0.5   # 429 재시도 대기 (초, 회차마다 2배 / Retry-After 헤더가 있으면 우선)
 
 CSV_FILE_NAME = ""        # 최종 입력 데이터 csv 파일 이름 (예: Final_Bridges.csv)
 OFFICE_NAME = "사무실"
@@ -30,11 +40,234 @@ PORT = 8000
 
 USE_API_CACHE = True      # True : API 절약을 위한 저장, False : 무조건 API 새로 받기
 CACHE_FILE_NAME = "route_cache.json"
+CACHE_READ_ONLY = False   # 배치 작업자 프로세스는 공유 캐시를 읽기만 함 (저장은 부모 프로세스 담당)
 
 DAILY_COLORS = [
     '#0000FF', '#FF0000', '#008000', '#800080', '#FFA500', '#000000', "#F005B5"
 ]
 
+# 지도 경로 경량화: (이 카카오맵 레벨 이하에서 사용, Douglas-Peucker 허용오차(도)) — 레벨이 클수록 축소된 지도
+ROUTE_LOD_LEVELS = [(4, 0.00001), (7, 0.00005), (10, 0.0003), (14, 0.002)]
+ROUTE_COORD_SCALE = 100000   # 좌표 정수화 배율 (소수점 5자리 ≈ 1m)
+
+METRICS_ENABLED = True    # True : 실행마다 계측 결과(JSON)를 METRICS_DIR에 저장
+METRICS_DIR = "metrics"
+CACHE_STALE_DAYS = 30     # 이보다 오래된 경로 캐시는 stale로 집계 (사용은 그대로 함)
+BRIDGE_VERSIONS_FILE = "bridge_versions.json"   # 캐시에 반영된 교량별 좌표 버전 (위치 보정된 교량의 캐시만 정리)
+
+# ==========================================
+# 1-1. 계측 (단계별 시간 / API 호출 / 캐시 / 탐색 카운터)
+# ==========================================
+class Metrics:
+    LATENCY_BUCKETS_MS = [50, 100, 200, 500, 1000, 2000, 5000]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.phases = {}        # 단계명 → {'count', 'total_sec', 'max_sec', 'counters'}
+            self.counters = {}
+            self.histograms = {}
+
+    def count(self, name, n=1):
+        with self.lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        ms = seconds * 1000
+        with self.lock:
+            h = self.histograms.setdefault(name, {'count': 0, 'sum_ms': 0.0, 'max_ms': 0.0, 'buckets': [0] * (len(self.LATENCY_BUCKETS_MS) + 1)})
+            h['count'] += 1
+            h['sum_ms'] += ms
+            h['max_ms'] = max(h['max_ms'], ms)
+            h['buckets'][next((i for i, b in enumerate(self.LATENCY_BUCKETS_MS) if ms <= b), len(self.LATENCY_BUCKETS_MS))] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        # 단계 실행 시간 + 단계 동안 증가한 search.* 카운터를 함께 기록 (단일 실행 기준)
+        with self.lock: before = {k: v for k, v in self.counters.items() if k.startswith('search.')}
+        start = time.perf_counter()
+        try: yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                p = self.phases.setdefault(name, {'count': 0, 'total_sec': 0.0, 'max_sec': 0.0, 'counters': {}})
+                p['count'] += 1
+                p['total_sec'] += elapsed
+                p['max_sec'] = max(p['max_sec'], elapsed)
+                for k, v in self.counters.items():
+                    if k.startswith('search.') and v != before.get(k, 0):
+                        p['counters'][k] = p['counters'].get(k, 0) + v - before.get(k, 0)
+
+    def timed(self, name):
+        # 함수 전체를 하나의 단계로 기록하는 데코레이터
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name): return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def merge(self, summary):
+        # 작업자 프로세스에서 돌려받은 summary()를 합산 (solver는 자식 프로세스에서 실행되므로)
+        with self.lock:
+            for name, p in summary['phases'].items():
+                mine = self.phases.setdefault(name, {'count': 0, 'total_sec': 0.0, 'max_sec': 0.0, 'counters': {}})
+                mine['count'] += p['count']
+                mine['total_sec'] += p['total_sec']
+                mine['max_sec'] = max(mine['max_sec'], p['max_sec'])
+                for k, v in p['counters'].items(): mine['counters'][k] = mine['counters'].get(k, 0) + v
+            for k, v in summary['counters'].items(): self.counters[k] = self.counters.get(k, 0) + v
+            for name, h in summary['api_latency'].items():
+                mine = self.histograms.setdefault(name, {'count': 0, 'sum_ms': 0.0, 'max_ms': 0.0, 'buckets': [0] * (len(self.LATENCY_BUCKETS_MS) + 1)})
+                mine['count'] += h['count']
+                mine['sum_ms'] += h['avg_ms'] * h['count']
+                mine['max_ms'] = max(mine['max_ms'], h['max_ms'])
+                mine['buckets'] = [a + b for a, b in zip(mine['buckets'], h['buckets'].values())]
+
+    def summary(self):
+        with self.lock:
+            phases = {}
+            for name, p in self.phases.items():
+                rates = {f"{k}_per_sec": v / p['total_sec'] for k, v in p['counters'].items() if p['total_sec'] > 0}
+                phases[name] = {**p, 'counters': dict(p['counters']), 'rates': rates}
+            hit, miss, stale, unknown = (self.counters.get(f"cache.{k}", 0) for k in ('hit', 'miss', 'stale', 'unknown_age'))
+            lookups = hit + miss
+            histograms = {}
+            for name, h in self.histograms.items():
+                labels = [f"<={b}ms" for b in self.LATENCY_BUCKETS_MS] + [f">{self.LATENCY_BUCKETS_MS[-1]}ms"]
+                histograms[name] = {'count': h['count'], 'avg_ms': h['sum_ms'] / h['count'], 'max_ms': h['max_ms'],
+                                    'buckets': dict(zip(labels, h['buckets']))}
+            return {
+                'started_at': datetime.datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'elapsed_sec': time.time() - self.started_at,
+                'phases': phases, 'counters': dict(self.counters), 'api_latency': histograms,
+                'cache': {'hit': hit, 'miss': miss, 'stale': stale, 'unknown_age': unknown,
+                          'hit_rate': hit / lookups if lookups else None, 'stale_rate': stale / hit if hit else None},
+            }
+
+    def dump(self, path=None):
+        if path is None:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            path = os.path.join(METRICS_DIR, f"run_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=4)
+        return path
+
+METRICS = Metrics()
+
+@contextlib.contextmanager
+def profile_to(path):
+    # path가 주어지면 구간 전체를 cProfile로 측정해 .prof 파일로 저장 (snakeviz 등으로 확인)
+    if not path:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try: yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"   🔬 프로파일 저장: {os.path.abspath(path)}")
+
+# ==========================================
+# 1-2. 진행 상황 보고 (solver / API 다운로드 → 출력 대상)
+# ==========================================
+# 계산 루프는 Progress.update()만 호출하고, 실제 출력은 sink가 담당 (sink별 최소 간격으로 제한)
+class ProgressSink:
+    enabled = True
+    interval = 0.2            # 같은 작업의 진행 이벤트 최소 간격 (초)
+
+    def emit(self, event): pass
+
+    def close(self):
+        # 마지막 update()가 이미 완료 상태(100%)를 보고해 finish()가 같은 이벤트를 다시 보내지 않을 때 호출
+        pass
+
+class NullProgress(ProgressSink):
+    # 아무것도 하지 않음 (벤치마크 / 서비스 작업자)
+    enabled = False
+
+class ConsoleProgress(ProgressSink):
+    # 터미널 한 줄 갱신 (\r)
+    def emit(self, event):
+        pct = f"{event['percent']:.1f}% " if event['percent'] is not None else ""
+        sys.stdout.write(f"\r      ▶ {event['label']}: {pct}({event['detail']})" + ("          \n" if event['final'] else ""))
+        sys.stdout.flush()
+
+    def close(self):
+        sys.stdout.write("\n")
+
+class LogProgress(ProgressSink):
+    # 이벤트마다 한 줄 (배치 로그 등), path가 없으면 현재 stdout
+    interval = 5.0
+
+    def __init__(self, path=None):
+        self.path, self.lock = path, threading.Lock()
+
+    def _write(self, line):
+        with self.lock:
+            if self.path is None: sys.stdout.write(line); return
+            with open(self.path, 'a', encoding='utf-8') as f: f.write(line)
+
+    def emit(self, event):
+        pct = f"{event['percent']:.1f}% " if event['percent'] is not None else ""
+        self._write(f"      [{datetime.datetime.now().strftime('%H:%M:%S')}] {event['label']}: {pct}({event['detail']})\n")
+
+class JsonProgress(LogProgress):
+    # 이벤트마다 JSON 한 줄 (다른 프로그램에서 읽기용)
+    interval = 1.0
+
+    def emit(self, event):
+        self._write(json.dumps({**event, 'ts': time.time()}, ensure_ascii=False, default=str) + "\n")
+
+PROGRESS_SINKS = {'console': ConsoleProgress, 'log': LogProgress, 'json': JsonProgress, 'none': NullProgress}
+PROGRESS_SINK = ConsoleProgress()
+
+def set_progress_sink(sink):
+    global PROGRESS_SINK
+    previous, PROGRESS_SINK = PROGRESS_SINK, sink
+    return previous
+
+@contextlib.contextmanager
+def progress_to(sink):
+    previous = set_progress_sink(sink)
+    try: yield sink
+    finally: set_progress_sink(previous)
+
+class Progress:
+    # 작업 하나의 진행 보고: update()는 간격 안의 호출을 바로 버리므로 hot loop에서 호출해도 부담이 없음
+    # detail은 출력할 때만 format(done, total, **fields)으로 만듦
+    def __init__(self, task, total=None, label="진행도", detail="{done}/{total}", sink=None):
+        self.sink = sink or PROGRESS_SINK
+        self.active = self.sink.enabled
+        self.task, self.total, self.label, self.detail = task, total, label, detail
+        self.started = self.next_at = time.monotonic()
+        self.reported = None      # 마지막으로 내보낸 (done, percent)
+
+    def update(self, done, percent=None, **fields):
+        if not self.active: return
+        now = time.monotonic()
+        if now < self.next_at: return
+        self.next_at = now + self.sink.interval
+        self._emit(done, percent, fields, False, self.detail)
+
+    def finish(self, done=None, detail=None, **fields):
+        if not self.active: return
+        done = self.total if done is None else done
+        if detail is None and not fields and self.reported == (done, 100.0): return self.sink.close()
+        self._emit(done, 100.0, fields, True, detail or self.detail)
+
+    def _emit(self, done, percent, fields, final, detail):
+        if percent is None and self.total: percent = min(100.0, done / self.total * 100)
+        self.reported = (done, percent)
+        self.sink.emit({'task': self.task, 'label': self.label, 'done': done, 'total': self.total, 'percent': percent,
+                        'elapsed_sec': time.monotonic() - self.started, 'final': final,
+                        'detail': detail.format(done=done, total=self.total, **fields), **fields})
+
 # ==========================================
 # 2. 캐시 관리 및 API 함수
 # ==========================================
@@ -48,19 +281,46 @@ def load_cache():
     return {}
 
 def save_cache(cache_data):
-    if not USE_API_CACHE: return
+    if not USE_API_CACHE or CACHE_READ_ONLY: return
     try:
         with open(CACHE_FILE_NAME, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, ensure_ascii=False, indent=4)
     except: pass
 
-route_cache = load_cache()
+route_cache = None   # 첫 사용 시 load_cache()로 불러옴 (get_route_cache)
+_route_cache_lock = threading.Lock()
 
-def get_coordinate(address):
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+def get_route_cache():
+    global route_cache
+    with _route_cache_lock:
+        if route_cache is None: route_cache = load_cache()
+    return route_cache
+
+def _cache_entry_used(data):
+    # 수집 시각(fetched_at)이 없는 항목(계측 도입 전에 저장된 캐시)은 나이를 알 수 없으므로 따로 집계
+    METRICS.count('cache.hit')
+    if 'fetched_at' not in data: METRICS.count('cache.unknown_age')
+    elif time.time() - data['fetched_at'] > CACHE_STALE_DAYS * 86400: METRICS.count('cache.stale')
+
+def _api_get(kind, url, params):
+    # Kakao API GET + 지연시간 계측, 429는 Retry-After(없으면 지수 백오프)만큼 기다렸다 재시도
+    import requests
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
+    for attempt in range(API_MAX_RETRIES + 1):
+        METRICS.count(f'api.{kind}.calls')
+        t0 = time.perf_counter()
+        resp = requests.get(url, headers=headers, params=params, timeout=API_TIMEOUT)
+        METRICS.observe(kind, time.perf_counter() - t0)
+        if resp.status_code != 429 or attempt == API_MAX_RETRIES: return resp
+        METRICS.count(f'api.{kind}.throttled')
+        try: wait = float(resp.headers['Retry-After'])
+        except (KeyError, ValueError): wait = API_RETRY_BACKOFF * 2 ** attempt
+        time.sleep(wait)
+
+@METRICS.timed('geocode')
+def get_coordinate(address):
     try:
-        resp = requests.get(url, headers=headers, params={"query": address})
+        resp = _api_get('geocode', f"{KAKAO_LOCAL_API_URL}/v2/local/search/address.json", {"query": address})
         doc = resp.json()['documents'][0]
         return f"{doc['x']},{doc['y']}"
     except: return None
@@ -69,20 +329,23 @@ def get_kakao_route_data(origin, destination, departure_time=None):
     cache_key = f"{origin}|{destination}"
     if origin == destination: return 0, []
     
+    route_cache = get_route_cache()
     if USE_API_CACHE and cache_key in route_cache:
         data = route_cache[cache_key]
+        _cache_entry_used(data)
         return data.get('time', data.get('duration', 0)), data['path']
+    if USE_API_CACHE: METRICS.count('cache.miss')
 
-    url = "https://apis-navi.kakaomobility.com/v1/directions"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
+    url = f"{KAKAO_NAVI_API_URL}/v1/directions"
     params = {"origin": origin, "destination": destination, "priority": "RECOMMEND", "car_type": 1}
     if departure_time: params["departure_time"] = departure_time
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get('directions', url, params)
         if response.status_code != 200 and departure_time:
+            METRICS.count(f'api.directions.status_{response.status_code}')
             del params["departure_time"]
-            response = requests.get(url, headers=headers, params=params)
+            response = _api_get('directions', url, params)
         
         if response.status_code == 200:
             result = response.json()
@@ -98,9 +361,10 @@ def get_kakao_route_data(origin, destination, departure_time=None):
                             path_data.append({'lng': vertexes[i], 'lat': vertexes[i+1]})
                 
                 if USE_API_CACHE:
-                    route_cache[cache_key] = {'time': duration, 'path': path_data}
+                    route_cache[cache_key] = {'time': duration, 'path': path_data, 'fetched_at': time.time()}
                 return duration, path_data
-    except Exception as e: pass
+        METRICS.count(f'api.directions.status_{response.status_code}')
+    except Exception as e: METRICS.count('api.directions.errors')
     return 0, []
 
 def get_route_wrapper(args):
@@ -109,21 +373,28 @@ def get_route_wrapper(args):
     cache_key = f"{start_node['coord']}|{end_node['coord']}"
     return (start_node['id'], end_node['id']), {'time': sec, 'path': path}, cache_key
 
-def build_od_matrix(nodes, start_datetime_str):
+@METRICS.timed('matrix')
+def build_od_matrix(nodes, start_datetime_str, matrix=None, only_ids=None):
+    # matrix + only_ids 지정 시: 기존 행렬에 only_ids 노드의 행/열만 채움 (증분 재계획)
+    import concurrent.futures
     n = len(nodes)
-    matrix = {} 
+    matrix = {} if matrix is None else matrix
+    route_cache = get_route_cache()
     print(f"\n   📡 [데이터 수집] 카카오 API 교통정보 스캔 중...")
     
     tasks = []
-    total_pairs = n * (n-1)
+    total_pairs = 0
     for i in range(n):
         for j in range(n):
+            if only_ids is not None and nodes[i]['id'] not in only_ids and nodes[j]['id'] not in only_ids: continue
+            if i != j: total_pairs += 1
             if i == j: 
                 matrix[(nodes[i]['id'], nodes[j]['id'])] = {'time': 0, 'path': []}
                 continue
             key = f"{nodes[i]['coord']}|{nodes[j]['coord']}"
             if USE_API_CACHE and key in route_cache:
                 data = route_cache[key]
+                _cache_entry_used(data)
                 matrix[(nodes[i]['id'], nodes[j]['id'])] = {'time': data.get('time', data.get('duration', 0)), 'path': data['path']}
             else:
                 tasks.append((nodes[i], nodes[j], start_datetime_str))
@@ -133,19 +404,16 @@ def build_od_matrix(nodes, start_datetime_str):
 
     if tasks:
         completed = 0
+        progress = Progress('matrix.download', len(tasks), "API 다운로드 진행률")
         with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
             future_to_route = {executor.submit(get_route_wrapper, t): t for t in tasks}
             for future in concurrent.futures.as_completed(future_to_route):
                 mat_key, val, cache_key = future.result()
                 matrix[mat_key] = val
-                if USE_API_CACHE: route_cache[cache_key] = val
-                
-                # [진행도 % 표시]
+                if USE_API_CACHE: route_cache[cache_key] = {**val, 'fetched_at': time.time()}
                 completed += 1
-                percent = (completed / len(tasks)) * 100
-                sys.stdout.write(f"\r      ▶ API 다운로드 진행률: {percent:.1f}% ({completed}/{len(tasks)})")
-                sys.stdout.flush()
-        print() 
+                progress.update(completed)
+        progress.finish()
         if USE_API_CACHE: save_cache(route_cache)
     
     return matrix
@@ -162,15 +430,19 @@ def calculate_total_duration(path, matrix):
         total_dist += return_cost
     return total_dist
 
-def run_deterministic_3opt(path, matrix):
+def run_deterministic_3opt(path, matrix, deadline=None):
+    # deadline: time.time() 기준 종료 시각 (초과 시 현재까지 개선된 경로 반환)
     current_path = path[:]
     n = len(current_path)
+    evaluated = accepted = 0
+    timed_out = False
     improved = True
     while improved:
         improved = False
         current_best_cost = calculate_total_duration(current_path, matrix)
         for i in range(1, n - 4):
             for j in range(i + 2, n - 2):
+                if deadline and time.time() > deadline: timed_out = True; break
                 for k in range(j + 2, n):
                     A, B, C, D = current_path[:i], current_path[i:j], current_path[j:k], current_path[k:]
                     cases = [
@@ -178,15 +450,19 @@ def run_deterministic_3opt(path, matrix):
                         A + C + B + D, A + C[::-1] + B + D, A + C + B[::-1] + D, A + C[::-1] + B[::-1] + D
                     ]
                     for case_path in cases:
+                        evaluated += 1
                         cost = calculate_total_duration(case_path, matrix)
                         if cost < current_best_cost:
                             current_path = case_path
                             current_best_cost = cost
                             improved = True
+                            accepted += 1
                             break 
                     if improved: break
                 if improved: break
-            if improved: break
+            if improved or timed_out: break
+    METRICS.count('search.3opt.evaluated', evaluated)
+    METRICS.count('search.3opt.accepted', accepted)
     return current_path
 
 def get_nearest_neighbor_path(nodes, matrix, start_node_id=0):
@@ -205,16 +481,24 @@ def get_nearest_neighbor_path(nodes, matrix, start_node_id=0):
 # ==========================================
 
 # [Route A] 모든 교량을 시작점으로 시도 + NN + 결정론적 3-opt (이전 Route B 로직)
-def solve_route_a(nodes, matrix, start_node_id=0):
+@METRICS.timed('solve.route_a')
+def solve_route_a(nodes, matrix, start_node_id=0, time_limit=None, initial_path=None):
     print(f"   📐 [Route A] 1st Bridge Exhaustive + NN + 결정론 3-opt 가동 중...")
     start_time = time.time()
+    deadline = start_time + time_limit if time_limit else None
     
     bridge_ids = [n['id'] for n in nodes if n['id'] != start_node_id]
     global_best_path = []
     global_min_dist = float('inf')
+    if initial_path:
+        # 이전 계획 경로(warm-start)를 기준 해로 두고 시나리오 탐색
+        global_best_path = run_deterministic_3opt(initial_path, matrix, deadline)
+        global_min_dist = calculate_total_duration(global_best_path, matrix)
     total_scenarios = len(bridge_ids)
+    progress = Progress('route_a', total_scenarios, "시나리오 분석 중")
     
     for idx, first_id in enumerate(bridge_ids):
+        if deadline and global_best_path and time.time() > deadline: break
         path = [start_node_id, first_id]
         unvisited = set(bridge_ids) - {first_id}
         curr = first_id
@@ -224,18 +508,16 @@ def solve_route_a(nodes, matrix, start_node_id=0):
             unvisited.remove(next_n)
             curr = next_n
             
-        optimized_path = run_deterministic_3opt(path, matrix)
+        optimized_path = run_deterministic_3opt(path, matrix, deadline)
         dist = calculate_total_duration(optimized_path, matrix)
         
         if dist < global_min_dist:
             global_min_dist = dist
             global_best_path = optimized_path
             
-        percent = ((idx + 1) / total_scenarios) * 100
-        sys.stdout.write(f"\r      ▶ 시나리오 분석 중: {percent:.1f}% ({idx+1}/{total_scenarios})")
-        sys.stdout.flush()
+        progress.update(idx + 1)
 
-    sys.stdout.write("\n")
+    progress.finish()
     elapsed_time = time.time() - start_time
     return global_best_path, global_min_dist, elapsed_time
 
@@ -253,12 +535,14 @@ def apply_pure_random_3opt(path):
     else:           result = A + C[::-1] + B + D
     return result
 
-def solve_route_b(nodes, matrix, start_node_id=0):
+@METRICS.timed('solve.route_b')
+def solve_route_b(nodes, matrix, start_node_id=0, time_limit=None, initial_path=None):
     print(f"   🧬 [Route B] NN + Pure Random SA + 즉시 결정론 3-opt 가동 중...")
     start_time = time.time()
+    deadline = start_time + time_limit if time_limit else None
     
-    current_path = get_nearest_neighbor_path(nodes, matrix, start_node_id)
-    current_path = run_deterministic_3opt(current_path, matrix)
+    current_path = initial_path[:] if initial_path else get_nearest_neighbor_path(nodes, matrix, start_node_id)
+    current_path = run_deterministic_3opt(current_path, matrix, deadline)
     current_cost = calculate_total_duration(current_path, matrix)
     
     best_path = current_path[:]
@@ -267,24 +551,26 @@ def solve_route_b(nodes, matrix, start_node_id=0):
     cooling_rate = 0.9995
     min_temperature = 0.1
     iter_count = 0
+    sa_accepted = 0
     total_expected_iters = 23024 
+    progress = Progress('route_b', total_expected_iters, detail="현재온도: {temp:.1f}도")
     
     while T > min_temperature:
         iter_count += 1
-        if iter_count % 1000 == 0:
-            percent = min(100.0, (iter_count / total_expected_iters) * 100)
-            sys.stdout.write(f"\r      ▶ 진행도: {percent:.1f}% (현재온도: {T:.1f}도)")
-            sys.stdout.flush()
+        if iter_count % 100 == 0:
+            if deadline and time.time() > deadline: break
+            progress.update(iter_count, temp=T)
 
         neighbor_path = apply_pure_random_3opt(current_path)
         neighbor_cost = calculate_total_duration(neighbor_path, matrix)
         delta = neighbor_cost - current_cost
         
         if delta < 0 or random.random() < math.exp(-delta / T):
+            sa_accepted += 1
             current_path = neighbor_path
             current_cost = neighbor_cost
             if current_cost < best_cost * 1.1:
-                refined_path = run_deterministic_3opt(current_path, matrix)
+                refined_path = run_deterministic_3opt(current_path, matrix, deadline)
                 refined_cost = calculate_total_duration(refined_path, matrix)
                 if refined_cost < best_cost:
                     best_cost = refined_cost
@@ -293,10 +579,223 @@ def solve_route_b(nodes, matrix, start_node_id=0):
                     current_cost = refined_cost
         T *= cooling_rate
 
-    sys.stdout.write(f"\r      ▶ 진행도: 100.0% (완료)                          \n")
+    progress.finish(iter_count, detail="완료", temp=T)
+    METRICS.count('search.sa.evaluated', iter_count)
+    METRICS.count('search.sa.accepted', sa_accepted)
     elapsed_time = time.time() - start_time
     return best_path, best_cost, elapsed_time
 
+# [Route C] 집단 기반 유전 알고리즘 (순서 교차 + 자식별 고속 국소탐색)
+GA_POPULATION = 30          # 집단 크기
+GA_MAX_CHILDREN = 5000      # 시간 제한이 없을 때 생성할 최대 자식 수
+GA_STALL_CHILDREN = 300     # 최고 해 개선 없이 이만큼 자식이 나오면 집단 재구성 (다양성 회복)
+GA_MAX_RESTARTS = 3         # 재구성 후에도 개선이 없으면 종료
+GA_STALL_GENERATIONS = 40   # 최고 해 개선 없이 이만큼 세대(자식 GA_POPULATION개)가 지나면 시간 제한 전이라도 종료
+GA_MUTATION_RATE = 0.1      # 자식에 double-bridge 변이를 적용할 확률
+GA_NEIGHBORS = 12           # 국소탐색에서 검사할 가까운 교량 수
+GA_WORKERS = 1              # 2 이상: 자식 국소탐색을 작업자 프로세스에서 병렬 처리
+GA_ALTERNATIVES = 20        # 배틀 일정 평가에 함께 넘길 상위 후보 경로 수
+
+_GA_SHARED = {}             # 작업자 프로세스의 소요시간 표 / 후보 목록
+
+def _ga_init(D, neighbors):
+    _GA_SHARED['D'], _GA_SHARED['neighbors'] = D, neighbors
+
+def _ga_cost(t, D):
+    return sum(D[t[k]][t[k + 1]] for k in range(len(t) - 1)) + D[t[-1]][t[0]]
+
+def _ga_prefix(t, D):
+    # 위치 색인 + 정방향/역방향 누적 이동시간 (비대칭 구간 뒤집기 비용을 O(1)로 계산)
+    n = len(t)
+    pos, F, B = [0] * n, [0] * n, [0] * n
+    for k, v in enumerate(t): pos[v] = k
+    for k in range(1, n):
+        F[k] = F[k - 1] + D[t[k - 1]][t[k]]
+        B[k] = B[k - 1] + D[t[k]][t[k - 1]]
+    return pos, F, B
+
+def _ga_local_search(tour, D=None, neighbors=None):
+    # 2-opt(구간 뒤집기) + or-opt(1~3개 구간 이동, 방향 유지) — 가까운 교량 후보만 검사, 출발지(0번 위치)는 고정
+    if D is None: D, neighbors = _GA_SHARED['D'], _GA_SHARED['neighbors']
+    t = tour[:]
+    n = len(t)
+    if n < 5:
+        # 교량 3개 이하 → 모든 순서(최대 6가지)를 직접 비교
+        t = min(([t[0]] + list(p) for p in itertools.permutations(t[1:])), key=lambda x: _ga_cost(x, D))
+        return t, _ga_cost(t, D)
+    improved = True
+    while improved:
+        improved = False
+        pos, F, B = _ga_prefix(t, D)
+        for i in range(1, n - 1):
+            a, ti = t[i - 1], t[i]
+            for c in neighbors[a]:
+                j = pos[c]
+                if j <= i: continue
+                nxt = t[(j + 1) % n]
+                if D[a][c] + D[ti][nxt] + B[j] - B[i] < D[a][ti] + D[c][nxt] + F[j] - F[i]:
+                    t[i:j + 1] = t[i:j + 1][::-1]
+                    pos, F, B = _ga_prefix(t, D)
+                    improved = True
+                    break
+        # 마지막 위치까지 포함한 구간도 이동 (i + L == n이면 b는 출발지)
+        for L in (1, 2, 3):
+            i = 1
+            while i <= n - L:
+                s0, sL = t[i], t[i + L - 1]
+                a, b = t[i - 1], t[(i + L) % n]
+                gain = D[a][s0] + D[sL][b] - D[a][b]
+                moved = False
+                if gain > 0:
+                    for d in neighbors[sL]:
+                        p = pos[d]
+                        # 제자리(구간 안 / 바로 뒤) 삽입 제외 — 꼬리 구간은 출발지 앞(p == 0)이 곧 제자리
+                        if i <= p <= i + L or (p == 0 and i + L == n): continue
+                        c = t[p - 1]
+                        if D[c][s0] + D[sL][d] - D[c][d] < gain:
+                            seg, rest = t[i:i + L], t[:i] + t[i + L:]
+                            k = rest.index(d) if d != t[0] else len(rest)
+                            t = rest[:k] + seg + rest[k:]
+                            pos = _ga_prefix(t, D)[0]
+                            improved = moved = True
+                            break
+                if not moved: i += 1
+    return t, _ga_cost(t, D)
+
+def _ga_nearest_tour(first, D, n):
+    tour, unvisited = [0, first], set(range(1, n)) - {first}
+    while unvisited:
+        nxt = min(unvisited, key=lambda x: D[tour[-1]][x])
+        tour.append(nxt)
+        unvisited.remove(nxt)
+    return tour
+
+def _ga_order_crossover(p1, p2):
+    # 순서 교차(OX): p1의 구간은 그대로, 나머지는 p2의 방문 순서(방향) 유지 → 비대칭 경로에 적합
+    body1, body2 = p1[1:], p2[1:]
+    m = len(body1)
+    i, j = sorted(random.sample(range(m + 1), 2))
+    seg = body1[i:j]
+    used = set(seg)
+    rest = [v for v in body2[j:] + body2[:j] if v not in used]
+    return [0] + rest[m - j:] + seg + rest[:m - j]
+
+def _ga_double_bridge(t):
+    if len(t) < 8: return t[:]
+    i, j, k = sorted(random.sample(range(1, len(t)), 3))
+    return t[:i] + t[j:k] + t[i:j] + t[k:]
+
+@METRICS.timed('solve.route_c')
+def solve_route_c(nodes, matrix, start_node_id=0, time_limit=None, initial_path=None, workers=None, alternatives=None):
+    # alternatives: 리스트를 넘기면 최종 집단의 상위 경로(GA_ALTERNATIVES개)를 채워 줌
+    print(f"   🧪 [Route C] Genetic (순서 교차 + 자식별 국소탐색) 가동 중...")
+    start_time = time.time()
+    deadline = start_time + time_limit if time_limit else None
+    workers = workers or GA_WORKERS
+
+    # 내부 계산은 0..n-1 색인 + 2차원 표 (0번 = 출발지)
+    ids = [start_node_id] + [nd['id'] for nd in nodes if nd['id'] != start_node_id]
+    n = len(ids)
+    no_route = 10 ** 9
+    D = [[matrix.get((a, b), {}).get('time', no_route) for b in ids] for a in ids]
+    if n < 5:
+        # 교량 3개 이하 → 모든 방문 순서를 직접 비교 (집단 탐색 불필요)
+        tours = sorted(([0] + list(p) for p in itertools.permutations(range(1, n))), key=lambda t: _ga_cost(t, D))
+        if alternatives is not None: alternatives.extend([ids[k] for k in t] for t in tours[:GA_ALTERNATIVES])
+        best_path = [ids[k] for k in tours[0]]
+        return best_path, calculate_total_duration(best_path, matrix), time.time() - start_time
+    neighbors = [sorted((j for j in range(1, n) if j != i), key=lambda j: D[i][j])[:GA_NEIGHBORS] for i in range(n)]
+
+    executor = None
+    if workers > 1:
+        import concurrent.futures
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_ga_init, initargs=(D, neighbors))
+    def improve(tours):
+        if executor: return list(executor.map(_ga_local_search, tours, chunksize=max(1, len(tours) // workers)))
+        return [_ga_local_search(t, D, neighbors) for t in tours]
+
+    def random_tour():
+        body = list(range(1, n))
+        random.shuffle(body)
+        return [0] + body
+
+    def seed_tours(count):
+        # NN + Route A 방식(첫 교량별 NN) + 무작위 경로
+        firsts = random.sample(range(1, n), min(n - 1, count // 3))
+        tours = [_ga_nearest_tour(neighbors[0][0], D, n)] + [_ga_nearest_tour(f, D, n) for f in firsts]
+        return tours + [random_tour() for _ in range(count - len(tours))]
+
+    initial = []
+    if initial_path:
+        idx = {nid: k for k, nid in enumerate(ids)}
+        initial = [[idx[nid] for nid in initial_path]]
+
+    try:
+        population = improve(initial + seed_tours(GA_POPULATION - len(initial)))
+        population.sort(key=lambda x: x[1])
+        seen = {tuple(t) for t, _ in population}
+        best_tour, best_cost = population[0]
+        children = stall = restarts = since_best = 0
+        batch = workers * 2 if executor else 1
+        progress = Progress('route_c', time_limit or GA_MAX_CHILDREN, detail="자식 {done}개, 최고 {best_min}분")
+
+        while children < GA_MAX_CHILDREN or deadline:
+            if deadline and time.time() > deadline: break
+            offspring = []
+            for _ in range(batch):
+                p1 = min(random.sample(population, 2), key=lambda x: x[1])[0]   # 토너먼트 선택
+                p2 = min(random.sample(population, 2), key=lambda x: x[1])[0]
+                child = _ga_order_crossover(p1, p2)
+                if random.random() < GA_MUTATION_RATE: child = _ga_double_bridge(child)
+                offspring.append(child)
+
+            for tour, cost in improve(offspring):
+                children += 1
+                stall += 1
+                since_best += 1
+                key = tuple(tour)
+                # 다양성 유지: 집단에 이미 있는 경로는 버리고, 가장 나쁜 해보다 좋을 때만 교체
+                if key in seen or cost >= population[-1][1]: continue
+                seen.discard(tuple(population[-1][0]))
+                population[-1] = (tour, cost)
+                seen.add(key)
+                population.sort(key=lambda x: x[1])
+                if cost < best_cost:
+                    best_tour, best_cost, stall, since_best = tour, cost, 0, 0
+
+            # 수렴 판단: 재구성을 거쳐도 GA_STALL_GENERATIONS 세대 동안 개선이 없으면 남은 시간을 쓰지 않고 종료
+            if since_best >= GA_STALL_GENERATIONS * GA_POPULATION: break
+
+            if stall >= GA_STALL_CHILDREN:
+                # 수렴 → 상위 해 일부 + 최고 해 변형 + 새 무작위 경로로 집단 재구성
+                restarts += 1
+                if restarts > GA_MAX_RESTARTS and not deadline: break
+                elite = population[:max(2, GA_POPULATION // 10)]
+                fresh = improve([_ga_double_bridge(best_tour) for _ in range(GA_POPULATION // 3)]
+                                + [random_tour() for _ in range(GA_POPULATION - len(elite) - GA_POPULATION // 3)])
+                population = sorted(elite + fresh, key=lambda x: x[1])
+                seen = {tuple(t) for t, _ in population}
+                stall = 0
+
+            limit_pct = (time.time() - start_time) / time_limit * 100 if time_limit else children / GA_MAX_CHILDREN * 100
+            progress.update(children, min(100.0, limit_pct), best_min=int(best_cost / 60))
+    finally:
+        if executor: executor.shutdown()
+
+    progress.finish(children, detail="완료, 자식 {done}개 / 재구성 {restarts}회", restarts=restarts, best_min=int(best_cost / 60))
+    METRICS.count('search.ga.children', children)
+    METRICS.count('search.ga.restarts', restarts)
+    if alternatives is not None: alternatives.extend([ids[k] for k in t] for t, _ in population[:GA_ALTERNATIVES])
+    best_path = [ids[k] for k in best_tour]
+    return best_path, calculate_total_duration(best_path, matrix), time.time() - start_time
+
+# 배틀/벤치마크에 참가하는 solver 목록: solver(nodes, matrix, start_node_id, time_limit, initial_path) -> (path, cost, elapsed)
+SOLVERS = {
+    'route_a': solve_route_a,
+    'route_b': solve_route_b,
+    'route_c': solve_route_c,
+}
+
 # ==========================================
 # 5. 시각화 및 유틸 (이하 동일)
 # ==========================================
@@ -305,13 +804,65 @@ def print_separator(title):
     print(f" {title}")
     print(f"{'='*60}")
 
-def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name):
-    print("\n   🎨 [지도 생성] HTML 리포트를 작성하고 있습니다...")
-    js_paths = []
+def simplify_polyline(points, tolerance):
+    # Douglas-Peucker (재귀 대신 스택 사용), points: [(lat, lng), ...]
+    n = len(points)
+    if n < 3 or tolerance <= 0: return points[:]
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tol2 = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        s, e = stack.pop()
+        (y1, x1), (y2, x2) = points[s], points[e]
+        dx, dy = x2 - x1, y2 - y1
+        seg2 = dx * dx + dy * dy
+        max_d, idx = 0.0, -1
+        for i in range(s + 1, e):
+            y, x = points[i]
+            t = 0.0 if seg2 == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / seg2))
+            d = (x1 + t * dx - x) ** 2 + (y1 + t * dy - y) ** 2
+            if d > max_d: max_d, idx = d, i
+        if max_d > tol2:
+            keep[idx] = True
+            stack.append((s, idx))
+            stack.append((idx, e))
+    return [p for p, k in zip(points, keep) if k]
+
+def encode_polyline(points):
+    # [lat, lng, Δlat, Δlng, ...] 정수 배열 (ROUTE_COORD_SCALE 배율)
+    out = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        ilat, ilng = round(lat * ROUTE_COORD_SCALE), round(lng * ROUTE_COORD_SCALE)
+        out += [ilat - prev_lat, ilng - prev_lng]
+        prev_lat, prev_lng = ilat, ilng
+    return out
+
+def build_route_payload(schedule_log):
+    # 일자별 → 구간별 → 줌 단계(LOD)별 단순화된 경로
+    days = {}
     for log in schedule_log:
-        day_idx = log['day'] - 1
-        color = DAILY_COLORS[day_idx % len(DAILY_COLORS)]
-        js_paths.append({'day': log['day'], 'color': color, 'path': log['path_data']})
+        pts = []
+        for p in log['path_data']:
+            pt = (round(float(p['lat']) * ROUTE_COORD_SCALE) / ROUTE_COORD_SCALE, round(float(p['lng']) * ROUTE_COORD_SCALE) / ROUTE_COORD_SCALE)
+            if not pts or pts[-1] != pt: pts.append(pt)
+        if len(pts) < 2: continue
+        day = days.setdefault(log['day'], {'day': log['day'], 'color': DAILY_COLORS[(log['day'] - 1) % len(DAILY_COLORS)], 'legs': []})
+        day['legs'].append([encode_polyline(simplify_polyline(pts, tol)) for _, tol in ROUTE_LOD_LEVELS])
+    return {'scale': ROUTE_COORD_SCALE, 'lod_levels': [lvl for lvl, _ in ROUTE_LOD_LEVELS], 'days': [days[d] for d in sorted(days)]}
+
+@METRICS.timed('report')
+def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name, html_file=HTML_FILE, inline_data=False):
+    print("\n   🎨 [지도 생성] HTML 리포트를 작성하고 있습니다...")
+    # 경로 좌표는 HTML에 넣지 않고 별도 JSON(<리포트>.data.json)으로 저장 → 브라우저 캐시 / 일자별 지연 렌더링
+    # inline_data: 파일로 직접 여는 리포트(배치/재계획) — file://에서는 fetch가 막히므로 같은 데이터를 HTML에도 넣어 둠
+    payload = json.dumps(build_route_payload(schedule_log), separators=(',', ':'))
+    data_path = os.path.splitext(os.path.abspath(html_file))[0] + ".data.json"
+    with open(data_path, "w", encoding="utf-8") as f: f.write(payload)
+    data_url = f"{os.path.basename(data_path)}?v={hashlib.md5(payload.encode('utf-8')).hexdigest()[:10]}"
+    inline_json = payload.replace("</", "<\\/")   # </script> 조기 종료 방지
+    inline_script = f'<script type="application/json" id="route-data">{inline_json}</script>' if inline_data else ""
 
     js_markers = []
     for info in visited_nodes_info:
@@ -342,7 +893,7 @@ def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name):
     for i in range(1, max_day + 1):
         color = DAILY_COLORS[(i-1) % len(DAILY_COLORS)]
         date_str = day_date_map.get(i, "")
-        legend_items.append(f'<span style="color:{color}">■</span> Day {i} ({date_str})')
+        legend_items.append(f'<span class="legend-day" id="legend-day-{i}" onclick="toggleDay({i})"><span style="color:{color}">■</span> Day {i} ({date_str})</span>')
     
     total_nights = max_day - 1
     total_days = max_day
@@ -402,9 +953,12 @@ def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name):
             box-shadow: 0 2px 5px rgba(0,0,0,0.4); cursor: pointer; transition: transform 0.2s;
         }}
         .custom-marker:hover {{ transform: scale(1.2); z-index: 99; }}
+        .legend-day {{ cursor: pointer; }}
+        .legend-day.off {{ opacity: 0.35; }}
     </style>
 </head>
 <body>
+    {inline_script}
     <div id="map"></div>
     <div class="legend">
         <div style="font-weight:bold; margin-bottom:5px;">📅 일정 범례</div>
@@ -418,15 +972,73 @@ def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name):
     <script>
         var mapContainer = document.getElementById('map'), mapOption = {{ center: new kakao.maps.LatLng({js_markers[0]['lat']}, {js_markers[0]['lng']}), level: 9 }};
         var map = new kakao.maps.Map(mapContainer, mapOption);
-        var paths = {json.dumps(js_paths)};
         var markers = {json.dumps(js_markers)};
         var bounds = new kakao.maps.LatLngBounds();
-        
-        paths.forEach(function(p) {{
-            var linePath = [];
-            p.path.forEach(function(pt) {{ linePath.push(new kakao.maps.LatLng(pt.lat, pt.lng)); }});
-            var polyline = new kakao.maps.Polyline({{ path: linePath, strokeWeight: 6, strokeColor: p.color, strokeOpacity: 0.8, strokeStyle: 'solid' }});
-            polyline.setMap(map);
+        var routeData = null;
+
+        // 경로: 줌 레벨에 맞는 단순화 단계(LOD)만 필요할 때 복원
+        function lodIndex(level) {{
+            for (var i = 0; i < routeData.lod_levels.length; i++) if (level <= routeData.lod_levels[i]) return i;
+            return routeData.lod_levels.length - 1;
+        }}
+        function pathFor(item, lod) {{
+            if (!item.cache[lod]) {{
+                var arr = item.leg[lod], pts = [], lat = 0, lng = 0;
+                for (var i = 0; i < arr.length; i += 2) {{
+                    lat += arr[i]; lng += arr[i + 1];
+                    pts.push(new kakao.maps.LatLng(lat / routeData.scale, lng / routeData.scale));
+                }}
+                item.cache[lod] = pts;
+            }}
+            return item.cache[lod];
+        }}
+        function renderDay(d) {{
+            var lod = lodIndex(map.getLevel());
+            d.items = d.legs.map(function(leg) {{
+                var item = {{ leg: leg, cache: {{}} }};
+                item.line = new kakao.maps.Polyline({{ path: pathFor(item, lod), strokeWeight: 6, strokeColor: d.color, strokeOpacity: 0.8, strokeStyle: 'solid' }});
+                item.line.setMap(d.visible ? map : null);
+                return item;
+            }});
+        }}
+        function toggleDay(dayNum) {{
+            if (!routeData) return;
+            routeData.days.forEach(function(d) {{
+                if (d.day !== dayNum) return;
+                d.visible = !d.visible;
+                if (!d.items) renderDay(d);
+                d.items.forEach(function(it) {{ it.line.setMap(d.visible ? map : null); }});
+                document.getElementById('legend-day-' + dayNum).classList.toggle('off', !d.visible);
+            }});
+        }}
+        function loadRouteData() {{
+            // http로 열면 .data.json을 받아오고, file://이거나 받지 못하면 HTML에 넣어 둔 데이터 사용 (배치/재계획 리포트)
+            var inline = document.getElementById('route-data');
+            var fromInline = function(e) {{
+                if (inline) return JSON.parse(inline.textContent);
+                throw e || new Error('file://');
+            }};
+            if (location.protocol === 'file:') return Promise.resolve().then(function() {{ return fromInline(); }});
+            return fetch('{data_url}').then(function(r) {{ if (!r.ok) throw new Error(r.status); return r.json(); }}).catch(fromInline);
+        }}
+        loadRouteData().then(function(data) {{
+            routeData = data;
+            var queue = data.days.slice();
+            queue.forEach(function(d) {{ d.visible = true; }});
+            // 첫 화면을 빨리 그리기 위해 하루씩 프레임을 나누어 렌더링
+            (function next() {{
+                if (!queue.length) return;
+                var d = queue.shift();
+                if (!d.items) renderDay(d);
+                requestAnimationFrame(next);
+            }})();
+        }}).catch(function(e) {{ console.warn('경로 데이터를 불러오지 못했습니다. (file:// 대신 http 서버로 열거나 --serve-reports 사용)', e); }});
+        kakao.maps.event.addListener(map, 'zoom_changed', function() {{
+            if (!routeData) return;
+            var lod = lodIndex(map.getLevel());
+            routeData.days.forEach(function(d) {{
+                if (d.items) d.items.forEach(function(it) {{ it.line.setPath(pathFor(it, lod)); }});
+            }});
         }});
 
         markers.forEach(function(m) {{
@@ -451,22 +1063,166 @@ def generate_kakao_map_html(schedule_log, visited_nodes_info, winner_name):
 </html>
     """
     
-    abs_path = os.path.abspath(HTML_FILE)
+    abs_path = os.path.abspath(html_file)
     with open(abs_path, "w", encoding="utf-8") as f: f.write(html_content)
     print(f"   ✨ HTML 리포트 생성 완료: {abs_path}")
 
-def serve_and_open():
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def do_GET(self):
-            if self.path == '/': self.path = HTML_FILE
-            return http.server.SimpleHTTPRequestHandler.do_GET(self)
-    
+# ==========================================
+# 5-1. 리포트 서버 (멀티스레드 / gzip·brotli 압축 / ETag·Cache-Control)
+# ==========================================
+REPORT_COMPRESS_MIN_BYTES = 1024   # 이보다 작은 파일은 압축하지 않음
+
+class ReportServer:
+    # 계획(plan_id)별 리포트를 /reports/<plan_id>/ 경로로 백그라운드에서 제공
+    def __init__(self, host="127.0.0.1", port=PORT):
+        self.reports = {}        # plan_id → HTML 절대경로
+        self.encoded = {}        # (경로, 인코딩) → (수정시각, 크기, 본문, ETag)
+        import http.server
+        import importlib.util
+        self.brotli = importlib.util.find_spec('brotli') is not None   # 선택 사항 (pip install brotli) — 없으면 gzip만 사용
+        self.lock = threading.Lock()
+        self.httpd = http.server.ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.httpd.server_address[1]}"
+
+    def register(self, plan_id, html_file):
+        with self.lock: self.reports[str(plan_id)] = os.path.abspath(html_file)
+        return f"{self.url}/reports/{plan_id}/"
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread = None
+
+    def resolve(self, parts):
+        # /reports/<plan_id>/            → 리포트 HTML
+        # /reports/<plan_id>/<x>.data.json → 같은 리포트의 경로 데이터만 허용
+        with self.lock: html = self.reports.get(parts[1]) if len(parts) >= 2 and parts[0] == 'reports' else None
+        if not html or len(parts) > 3: return None
+        if len(parts) == 2: return html
+        data_file = os.path.splitext(html)[0] + ".data.json"
+        return data_file if parts[2] == os.path.basename(data_file) else None
+
+    def load(self, path, encoding):
+        st = os.stat(path)
+        with self.lock: cached = self.encoded.get((path, encoding))
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size): return cached[2], cached[3]
+        with open(path, 'rb') as f: raw = f.read()
+        if encoding == 'br':
+            import brotli
+            body = brotli.compress(raw)
+        elif encoding == 'gzip':
+            import gzip
+            body = gzip.compress(raw, compresslevel=6)
+        else: body = raw
+        etag = f'"{hashlib.md5(raw).hexdigest()}{"-" + encoding if encoding else ""}"'
+        with self.lock: self.encoded[(path, encoding)] = (st.st_mtime_ns, st.st_size, body, etag)
+        return body, etag
+
+    def index_html(self):
+        with self.lock: ids = sorted(self.reports)
+        links = "".join(f'<li><a href="/reports/{pid}/">{pid}</a></li>' for pid in ids)
+        return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>리포트 목록</title></head><body><h3>📁 리포트 목록</h3><ul>{links}</ul></body></html>'.encode('utf-8')
+
+    def _make_handler(self):
+        import http.server
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, code, body=b"", headers=None, head_only=False):
+                self.send_response(code)
+                for k, v in (headers or {}).items(): self.send_header(k, v)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if not head_only: self.wfile.write(body)
+
+            def _serve(self, head_only):
+                url_path, _, query = self.path.partition('?')
+                parts = [p for p in url_path.split('/') if p]
+                try:
+                    if not parts:
+                        return self._send(200, server.index_html(), {'Content-Type': 'text/html; charset=utf-8', 'Cache-Control': 'no-cache'}, head_only)
+                    if len(parts) == 2 and not url_path.endswith('/'):
+                        return self._send(301, headers={'Location': url_path + '/'}, head_only=head_only)
+                    path = server.resolve(parts)
+                    if not path or not os.path.exists(path):
+                        return self._send(404, "리포트를 찾을 수 없습니다.".encode('utf-8'), {'Content-Type': 'text/plain; charset=utf-8'}, head_only)
+
+                    accept = {e.split(';')[0].strip() for e in self.headers.get('Accept-Encoding', '').split(',')}
+                    encoding = None
+                    if os.path.getsize(path) >= REPORT_COMPRESS_MIN_BYTES:
+                        if server.brotli and 'br' in accept: encoding = 'br'
+                        elif 'gzip' in accept: encoding = 'gzip'
+                    body, etag = server.load(path, encoding)
+
+                    is_data = path.endswith('.data.json')
+                    headers = {
+                        'Content-Type': 'application/json' if is_data else 'text/html; charset=utf-8',
+                        'ETag': etag, 'Vary': 'Accept-Encoding',
+                        # 해시(?v=)가 붙은 경로 데이터는 내용이 바뀌면 주소도 바뀌므로 장기 캐시
+                        'Cache-Control': 'public, max-age=31536000, immutable' if is_data and 'v=' in query else 'no-cache',
+                    }
+                    if self.headers.get('If-None-Match') == etag:
+                        return self._send(304, headers={k: v for k, v in headers.items() if k != 'Content-Type'}, head_only=True)
+                    if encoding: headers['Content-Encoding'] = encoding
+                    self._send(200, body, headers, head_only)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                except Exception as e:
+                    self.log_error("리포트 제공 실패 (%s): %r", self.path, e)
+                    self._send(500, str(e).encode('utf-8'), {'Content-Type': 'text/plain; charset=utf-8'}, head_only)
+
+            def do_GET(self): self._serve(False)
+            def do_HEAD(self): self._serve(True)
+            def log_message(self, format, *args): pass
+            def log_error(self, format, *args): sys.stderr.write(f"   ⚠️ [리포트 서버] {format % args}\n")
+
+        return Handler
+
+_report_server = None
+
+def get_report_server():
+    global _report_server
+    if _report_server is None: _report_server = ReportServer().start()
+    return _report_server
+
+def serve_and_open(html_file=HTML_FILE, plan_id="latest", block=True):
     print_separator("서비스 실행")
-    print(f"   🌍 지도 뷰어를 실행합니다...")
-    threading.Timer(1.5, lambda: webbrowser.open(f"http://localhost:{PORT}")).start()
-    with socketserver.TCPServer(("127.0.0.1", PORT), Handler) as httpd:
-        try: httpd.serve_forever()
-        except: pass
+    server = get_report_server()
+    url = server.register(plan_id, html_file)
+    print(f"   🌍 지도 뷰어를 실행합니다... ({url})")
+    import webbrowser
+    threading.Timer(1.5, lambda: webbrowser.open(url)).start()
+    if not block: return server
+    try: input("   ⏹  엔터를 누르면 지도 서버를 종료합니다.\n")
+    except (KeyboardInterrupt, EOFError): pass
+    server.stop()
+
+def serve_report_dir(report_dir, port=PORT):
+    # 배치/재계획 결과 폴더의 <plan_id>.html을 모두 등록해 포그라운드로 제공 (Ctrl+C 종료)
+    print_separator("리포트 서버")
+    if not os.path.isdir(report_dir): return print(f"   ❌ 리포트 폴더가 없습니다: {report_dir}")
+    server = ReportServer(port=port)
+    for name in sorted(os.listdir(report_dir)):
+        plan_id, ext = os.path.splitext(name)
+        if ext == '.html' and is_valid_plan_id(plan_id): server.register(plan_id, os.path.join(report_dir, name))
+    if not server.reports: print(f"   ⚠️ 등록할 리포트(<plan_id>.html)가 없습니다: {report_dir}")
+    print(f"   📁 리포트 {len(server.reports)}개 등록 → {server.url}/ 에서 확인 (Ctrl+C 종료)")
+    try: server.httpd.serve_forever()
+    except KeyboardInterrupt: pass
+    server.httpd.server_close()
 
 def get_next_day_start_time(day_num):
     print(f"\n   💤 [숙박 결정] Day {day_num} 일정을 시작합니다.")
@@ -477,20 +1233,1211 @@ def get_next_day_start_time(day_num):
             return datetime.time(h, m)
         except: print("   ❌ 올바른 형식(HH:MM)으로 입력해주세요.")
 
+def ask_overtime_decision(target_name, fin_dt, limit_dt, is_return):
+    # True : 연장근무(퇴근 강행), False : 숙박 후 다음날
+    prompt = "퇴근 강행(y) / 숙박 후 다음날(n)? " if is_return else "연장근무(y) / 숙박 후 다음날(n)? "
+    while True:
+        c = input(f"          >> {prompt}").lower()
+        if c=='y': return True
+        elif c=='n': return False
+
+def load_bridge_csv(csv_file=None):
+    # 교량 목록은 레지스트리(opf_planner/registry.py)의 바이너리 스냅샷을 메모리 맵으로 로드 → 인코딩 재시도/재파싱 없음
+    # 스냅샷은 CSV 옆에 자동 생성되고, 위치 보정 화면 밖에서 CSV가 수정되면 다시 만듦
+    from opf_planner import registry
+    reg = registry.load(csv_file or CSV_FILE_NAME)
+    if reg is None: return None
+    forget_moved_bridges(reg)
+    return reg.frame()
+
+def forget_moved_bridges(reg):
+    # 마지막으로 반영한 교량별 좌표 버전과 비교 → 좌표가 바뀐 교량의 이전 좌표가 들어간 경로/계획 캐시만 삭제
+    if CACHE_READ_ONLY: return
+    try:
+        with open(BRIDGE_VERSIONS_FILE, 'r', encoding='utf-8') as f: seen = json.load(f)
+    except (OSError, ValueError): seen = {}
+    csv_path = os.path.abspath(reg.csv_file)
+    bridges = {key: [v, reg.coord(key)] for key, v in reg.versions().items()}
+    if seen.get('csv') == csv_path and seen.get('bridges') == bridges: return
+
+    if seen.get('csv') == csv_path:
+        moved = reg.moved_since({key: v for key, (v, _) in seen['bridges'].items()})
+        stale = {seen['bridges'][key][1] for key in moved} - {coord for _, coord in bridges.values()}
+        if stale:
+            cache = get_route_cache()
+            dropped = [k for k in cache if k.partition('|')[0] in stale or k.partition('|')[2] in stale]
+            for k in dropped: del cache[k]
+            save_cache(cache)
+            METRICS.count('cache.invalidated', len(dropped))
+            forget_cached_plans(stale)
+    try:
+        with open(BRIDGE_VERSIONS_FILE, 'w', encoding='utf-8') as f: json.dump({'csv': csv_path, 'bridges': bridges}, f, ensure_ascii=False)
+    except OSError: pass
+
+def preload_planner_data(csv_file=None):
+    # 첫 입력을 기다리는 동안 교량 목록(pandas 포함)과 경로 캐시를 백그라운드에서 불러옴 → wait()로 결과 받기
+    result = {}
+    def work():
+        result['df'] = load_bridge_csv(csv_file)
+        get_route_cache()
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    def wait():
+        thread.join()
+        return result.get('df')
+    return wait
+
+def make_bridge_node(node_id, row, insp_time, insp_type):
+    # bridge_id: CSV의 ID 열 (없으면 None) — 이름/좌표가 같은 교량도 계획 캐시에서 구분하기 위해 유지
+    bridge_id = row.get('ID')
+    return {'id': node_id, 'name': row['name'], 'coord': f"{row['longitude']},{row['latitude']}", 'insp_time': insp_time, 'insp_type': insp_type,
+            'bridge_id': str(bridge_id) if bridge_id is not None and bridge_id == bridge_id else None}
+
+def run_battle(nodes, matrix, initial_path=None, schedule=None):
+    # schedule: {'start_dt', 'policy', 'return_times'} — 주어지면 실제 일정(사용 일수/연장근무) 기준으로 최종 선택
+    # 4-1. Route A 계산 (전수 조사 방식)
+    path_a, cost_a, time_a = solve_route_a(nodes, matrix, start_node_id=0, initial_path=initial_path)
+    
+    # 4-2. Route B 계산 (SA 방식)
+    path_b, cost_b, time_b = solve_route_b(nodes, matrix, start_node_id=0, initial_path=initial_path)
+
+    # 4-3. Route C 계산 (유전 알고리즘)
+    alternatives = []
+    path_c, cost_c, time_c = solve_route_c(nodes, matrix, start_node_id=0, initial_path=initial_path, alternatives=alternatives)
+    
+    # 4-4. 배틀 결과 판정 (동률이면 앞 순서 우선)
+    print_separator("배틀 결과 (Battle Result)")
+    print(f"   🔵 [Route A - Deep Search] 예상시간: {int(cost_a/60)}분 (계산소요: {time_a*1000:.1f}ms)")
+    print(f"   🔴 [Route B - Memetic SA] 예상시간: {int(cost_b/60)}분 (계산소요: {time_b*1000:.1f}ms)")
+    print(f"   🟢 [Route C - Genetic] 예상시간: {int(cost_c/60)}분 (계산소요: {time_c*1000:.1f}ms)")
+
+    contenders = [("Route A", "Deep Search", path_a, cost_a), ("Route B", "Memetic SA", path_b, cost_b), ("Route C", "Genetic", path_c, cost_c)]
+    ranked = sorted(contenders, key=lambda c: c[3])
+    (win_label, win_desc, winner_path, win_cost), runner_up = ranked[0], ranked[1]
+    if win_cost < runner_up[3]:
+        print(f"\n   🏆 [승자 확정] {win_label} 가 {int((runner_up[3] - win_cost)/60)}분 더 빠릅니다!")
+        winner_name = f"{win_label} ({win_desc})"
+    else:
+        print(f"\n   🤝 [무승부] {win_label}와 {runner_up[0]}의 최적 경로 시간이 동일합니다.")
+        winner_name = f"{win_label} (Tie-Breaker)"
+
+    battle = {
+        'route_a': {'cost_sec': cost_a, 'solve_ms': time_a * 1000},
+        'route_b': {'cost_sec': cost_b, 'solve_ms': time_b * 1000},
+        'route_c': {'cost_sec': cost_c, 'solve_ms': time_c * 1000},
+    }
+
+    if schedule:
+        # 4-5. 일정 평가: 세 결과 + Route C 상위 후보를 실제 일정 기준(사용 일수 → 연장근무 → 도착 시각)으로 재정렬
+        t0 = time.perf_counter()
+        tours = [c[2] for c in contenders] + alternatives
+        order, ev = rank_schedules(tours, nodes, matrix, schedule['start_dt'], schedule['policy'], schedule['return_times'])
+        eval_ms = (time.perf_counter() - t0) * 1000
+        for k, key in enumerate(('route_a', 'route_b', 'route_c')):
+            battle[key].update(days=int(ev['days'][k]), overtime_min=int(ev['overtime_min'][k]))
+        best = int(order[0])
+        battle['schedule'] = {'candidates': len(tours), 'eval_ms': eval_ms, 'days': int(ev['days'][best]), 'overtime_min': int(ev['overtime_min'][best])}
+        print(f"   📅 [일정 평가] 후보 {len(tours)}개 중 최선: {ev['days'][best]}일 / 연장근무 {ev['overtime_min'][best]}분 (계산소요: {eval_ms:.1f}ms)")
+        if tours[best] != winner_path:
+            label, desc = contenders[best][:2] if best < len(contenders) else ("Route C", f"Genetic 후보 #{best - len(contenders) + 1}")
+            winner_path, winner_name = tours[best], f"{label} ({desc}, 일정 기준)"
+            print(f"   🔁 [일정 기준 선택] {winner_name} 경로가 실제 일정상 더 유리합니다.")
+    return winner_path, winner_name, battle
+
+# ==========================================
+# 5-2. 일정 시뮬레이션 (정책 객체 + 구간 선행 조회)
+# ==========================================
+SIM_DEPARTURE_BUCKET_MIN = 15   # 구간 조회 출발 시각 단위 (분) — API의 departure_time은 이 단위로 내림해서 보냄
+SIM_PREFETCH_WORKERS = 8
+
+class SchedulePolicy(abc.ABC):
+    # 일정 시뮬레이션의 판단 기준: 근무시간 초과 시 연장근무 여부 / 숙박 후 다음날 출발 시각
+    verbose = False
+
+    @abc.abstractmethod
+    def decide_overtime(self, target_name, fin_dt, limit_dt, is_return): ...
+
+    @abc.abstractmethod
+    def next_day_start(self, day_num): ...
+
+    # 선행 조회용 추정 (입력을 받거나 상태를 바꾸면 안 됨)
+    def expect_overtime(self, target_name, fin_dt, limit_dt, is_return):
+        return self.decide_overtime(target_name, fin_dt, limit_dt, is_return)
+
+    def expected_next_day_start(self):
+        return self.next_day_start(None)
+
+    def on_event(self, message):
+        if self.verbose: print(message)
+
+class RulePolicy(SchedulePolicy):
+    # mode = "overtime"(항상 연장근무) / "overnight"(항상 숙박) / "limit"(초과분이 max_overtime_minutes 이하면 연장근무)
+    MODES = ('overtime', 'overnight', 'limit')
+
+    def __init__(self, mode='limit', max_overtime_minutes=0, return_max_overtime_minutes=None, next_day_start='09:00', verbose=False):
+        if mode not in self.MODES: raise ValueError(f"알 수 없는 연장근무 정책: {mode}")
+        self.mode = mode
+        self.max_over = datetime.timedelta(minutes=int(max_overtime_minutes))
+        self.max_return_over = self.max_over if return_max_overtime_minutes is None else datetime.timedelta(minutes=int(return_max_overtime_minutes))
+        self.start_t = parse_hhmm(next_day_start)
+        self.verbose = verbose
+
+    @classmethod
+    def from_dict(cls, policy, verbose=False):
+        keys = ('mode', 'max_overtime_minutes', 'return_max_overtime_minutes', 'next_day_start')
+        return cls(**{k: policy[k] for k in keys if k in policy}, verbose=verbose)
+
+    def decide_overtime(self, target_name, fin_dt, limit_dt, is_return):
+        if self.mode == 'overtime': return True
+        if self.mode == 'overnight': return False
+        return (fin_dt - limit_dt) <= (self.max_return_over if is_return else self.max_over)
+
+    def next_day_start(self, day_num):
+        return self.start_t
+
+class InteractivePolicy(SchedulePolicy):
+    # 기존 대화형 입력 — 선행 조회 시에는 숙박 / 09:00 출발로 가정
+    verbose = True
+
+    def __init__(self, expected_start='09:00'):
+        self.expected_start = parse_hhmm(expected_start)
+
+    def decide_overtime(self, target_name, fin_dt, limit_dt, is_return):
+        return ask_overtime_decision(target_name, fin_dt, limit_dt, is_return)
+
+    def next_day_start(self, day_num):
+        return get_next_day_start_time(day_num)
+
+    def expect_overtime(self, target_name, fin_dt, limit_dt, is_return):
+        return False
+
+    def expected_next_day_start(self):
+        return self.expected_start
+
+def departure_bucket(dt):
+    dt = dt - datetime.timedelta(minutes=dt.minute % SIM_DEPARTURE_BUCKET_MIN, seconds=dt.second, microseconds=dt.microsecond)
+    return dt.strftime("%Y%m%d%H%M")
+
+def _next_day_basis(day_basis, start_t):
+    return datetime.datetime.combine(day_basis.date() + datetime.timedelta(days=1), start_t)
+
+def speculate_schedule_legs(sorted_nodes, start_dt, dest_coord, policy, matrix=None):
+    # 실제 시뮬레이션과 같은 규칙으로 구간별 출발 시각을 추정 (숙박이 예상되면 다음날 아침 출발)
+    # 경로 캐시는 "출발지|도착지"로만 구분되므로 출발 시각을 바꿔 같은 구간을 여러 번 조회하지 않음 → 구간당 하나
+    legs = {}
+    day_basis = curr_dt = start_dt
+    prev_node = sorted_nodes[0]
+    for target in sorted_nodes[1:] + [{'id': None, 'name': None, 'coord': dest_coord, 'insp_time': 0}]:
+        move_min = (matrix or {}).get((prev_node['id'], target['id']), {}).get('time', 0) // 60
+        dep_dt, fin_dt = curr_dt, curr_dt + datetime.timedelta(minutes=move_min + target['insp_time'])
+        limit_dt = day_basis + datetime.timedelta(hours=WORK_LIMIT_HOURS)
+        if fin_dt > limit_dt and not policy.expect_overtime(target['name'], fin_dt, limit_dt, target['id'] is None):
+            day_basis = dep_dt = _next_day_basis(day_basis, policy.expected_next_day_start())
+            fin_dt = day_basis + datetime.timedelta(minutes=move_min + target['insp_time'])
+        if prev_node['coord'] != target['coord']: legs.setdefault((prev_node['coord'], target['coord']), departure_bucket(dep_dt))
+        curr_dt = fin_dt
+        prev_node = target
+    return [(origin, destination, dep) for (origin, destination), dep in legs.items()]
+
+def prefetch_schedule_legs(legs):
+    # legs: [(출발지, 도착지, 출발 시각)] → {(출발지, 도착지): (초, 경로)} — 같은 구간은 처음 나온 출발 시각으로 한 번만 조회
+    import concurrent.futures
+    unique = {}
+    for origin, destination, dep in legs: unique.setdefault((origin, destination), dep)
+    if not unique: return {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SIM_PREFETCH_WORKERS) as executor:
+        return dict(zip(unique, executor.map(lambda od: get_kakao_route_data(*od, unique[od]), unique)))
+
+@METRICS.timed('simulation')
+def simulate_schedule(sorted_nodes, start_dt, dest_name, dest_coord, policy, matrix=None):
+    # policy: SchedulePolicy (연장근무 / 다음날 출발 판단), matrix: 출발 시각 추정용 O-D 행렬 (없으면 이동 0분으로 추정)
+    legs = prefetch_schedule_legs(speculate_schedule_legs(sorted_nodes, start_dt, dest_coord, policy, matrix))
+
+    def route(origin, destination, dep_dt):
+        if origin == destination: return 0, []
+        if (origin, destination) in legs: METRICS.count('simulation.prefetch_hit')
+        else:
+            METRICS.count('simulation.prefetch_miss')
+            legs[(origin, destination)] = get_kakao_route_data(origin, destination, departure_bucket(dep_dt))
+        return legs[(origin, destination)]
+
+    current_day = 1
+    day_basis = start_dt
+    curr_dt = day_basis
+    prev_node = sorted_nodes[0]
+    
+    map_log = []
+    visited_info = [] 
+    
+    visited_info.append({
+        'name': prev_node['name'], 'coord': prev_node['coord'], 'order': 0,
+        'day': 1, 'date': day_basis.strftime('%Y-%m-%d'),
+        'move_min': 0, 'insp_min': 0, 'insp_type': '출발',
+        'arrival_time': curr_dt.strftime('%H:%M'), 'finish_time': curr_dt.strftime('%H:%M')
+    })
+    
+    policy.on_event(f"\n   🚩 [Day 1] {curr_dt.strftime('%H:%M')} 출발")
+
+    for i in range(1, len(sorted_nodes)):
+        target = sorted_nodes[i]
+        limit_dt = day_basis + datetime.timedelta(hours=WORK_LIMIT_HOURS)
+        
+        move_sec, path_data = route(prev_node['coord'], target['coord'], curr_dt)
+        move_min = move_sec // 60
+        
+        arr_dt = curr_dt + datetime.timedelta(minutes=move_min)
+        fin_dt = arr_dt + datetime.timedelta(minutes=target['insp_time'])
+        
+        is_next_day = False
+        if fin_dt > limit_dt:
+            policy.on_event(f"      ⚠️  경고: '{target['name']}' 작업 시 근무 시간 초과 예상 ({fin_dt.strftime('%H:%M')})")
+            is_next_day = not policy.decide_overtime(target['name'], fin_dt, limit_dt, False)
+        
+        if is_next_day:
+            current_day += 1
+            day_basis = _next_day_basis(day_basis, policy.next_day_start(current_day))
+            curr_dt = day_basis
+            policy.on_event(f"\n   ☀️ [Day {current_day}] {curr_dt.strftime('%Y-%m-%d %H:%M')} 출발")
+            
+            move_sec, path_data = route(prev_node['coord'], target['coord'], curr_dt)
+            move_min = move_sec // 60
+            arr_dt = curr_dt + datetime.timedelta(minutes=move_min)
+            fin_dt = arr_dt + datetime.timedelta(minutes=target['insp_time'])
+        
+        map_log.append({'day': current_day, 'start_id': prev_node['id'], 'end_id': target['id'], 'path_data': path_data})
+        visited_info.append({
+            'name': target['name'], 'coord': target['coord'], 'order': i,
+            'day': current_day, 'date': day_basis.strftime('%Y-%m-%d'),
+            'move_min': move_min, 'insp_min': target['insp_time'], 'insp_type': target['insp_type'],
+            'arrival_time': arr_dt.strftime('%H:%M'), 'finish_time': fin_dt.strftime('%H:%M')
+        })
+        
+        policy.on_event(f"      🚗 {move_min}분 이동 ➔ {target['name']} ({arr_dt.strftime('%H:%M')} 도착)")
+        curr_dt = fin_dt
+        prev_node = target
+
+    # 복귀
+    ret_sec, ret_path = route(prev_node['coord'], dest_coord, curr_dt)
+    ret_min = ret_sec // 60
+    final_dt = curr_dt + datetime.timedelta(minutes=ret_min)
+    limit_dt = day_basis + datetime.timedelta(hours=WORK_LIMIT_HOURS)
+    
+    is_return_delay = False
+    if final_dt > limit_dt:
+        over_minutes = int((final_dt - limit_dt).total_seconds() // 60)
+        policy.on_event(f"      ⚠️  경고: 복귀 시 근무 시간 초과 예상 ({final_dt.strftime('%H:%M')}, +{over_minutes}분)")
+        is_return_delay = not policy.decide_overtime(dest_name, final_dt, limit_dt, True)
+
+    if is_return_delay:
+        current_day += 1
+        day_basis = _next_day_basis(day_basis, policy.next_day_start(current_day))
+        curr_dt = day_basis
+        ret_sec, ret_path = route(prev_node['coord'], dest_coord, curr_dt)
+        ret_min = ret_sec // 60
+        final_dt = curr_dt + datetime.timedelta(minutes=ret_min)
+        policy.on_event(f"\n   ☀️ [Day {current_day}] 복귀 출발")
+
+    map_log.append({'day': current_day, 'start_id': prev_node['id'], 'end_id': 0, 'path_data': ret_path})
+    visited_info.append({
+        'name': f"{dest_name} (도착)", 'coord': dest_coord, 'order': len(sorted_nodes),
+        'day': current_day, 'date': day_basis.strftime('%Y-%m-%d'),
+        'move_min': ret_min, 'insp_min': 0, 'insp_type': '복귀',
+        'arrival_time': final_dt.strftime('%H:%M'), 'finish_time': final_dt.strftime('%H:%M')
+    })
+    
+    policy.on_event(f"      🚗 {ret_min}분 이동 ➔ {dest_name} ({final_dt.strftime('%H:%M')} 도착)")
+    return map_log, visited_info
+
+def print_schedule_summary(visited_info):
+    print_separator("최종 스케줄 요약")
+    print(f"{'순서':<5} | {'Day':<5} | {'장소명':<15} | {'도착':<8} | {'이동(분)':<8} | {'작업(분)':<8}")
+    print("-" * 70)
+    for info in visited_info:
+        print(f"{info['order']:<5} | {info['day']:<5} | {info['name']:<15} | {info['arrival_time']:<8} | {info['move_min']:<8} | {info['insp_min']:<8}")
+    print("-" * 70)
+
+# ==========================================
+# 5-3. 후보 경로 일정 일괄 평가 (NumPy)
+# ==========================================
+# simulate_schedule과 같은 규칙(근무시간 초과 → 연장근무/숙박, 복귀 구간 포함)을 O-D 행렬 기준으로
+# 후보 M개에 대해 한꺼번에 계산 → 총 이동시간이 아니라 실제 일정(사용 일수, 연장근무)으로 후보 비교
+def _vector_policy(policy):
+    # (mode, 최대 연장(분), 복귀 최대 연장(분), 다음날 출발(분)) — RulePolicy가 아니면 선행 조회와 같은 가정(숙박)
+    if isinstance(policy, RulePolicy):
+        return (policy.mode, policy.max_over.total_seconds() // 60, policy.max_return_over.total_seconds() // 60,
+                policy.start_t.hour * 60 + policy.start_t.minute)
+    start_t = policy.expected_next_day_start() if policy else datetime.time(9, 0)
+    return ('overnight', 0, 0, start_t.hour * 60 + start_t.minute)
+
+def schedule_return_times(nodes, dest_coord, matrix):
+    # 노드별 도착지(dest_coord) 복귀 소요시간(초): 출발지로 복귀하면 행렬 사용, 아니면 복귀 구간을 스레드 풀로 한꺼번에 조회
+    start = nodes[0]
+    if dest_coord == start['coord']: return {nd['id']: matrix.get((nd['id'], start['id']), {}).get('time', 0) for nd in nodes}
+    legs = prefetch_schedule_legs([(nd['coord'], dest_coord, None) for nd in nodes if nd['coord'] != dest_coord])
+    return {nd['id']: legs[(nd['coord'], dest_coord)][0] if nd['coord'] != dest_coord else 0 for nd in nodes}
+
+def evaluate_schedules(tours, nodes, matrix, start_dt, policy, return_times):
+    # tours: 방문 순서(노드 id, 출발지 포함) 목록 M개 → 일정 지표 배열 (시각은 start_dt 당일 0시 기준 분)
+    import numpy as np
+    ids = [nd['id'] for nd in nodes]
+    idx = {nid: k for k, nid in enumerate(ids)}
+    T = np.array([[matrix.get((a, b), {}).get('time', 0) // 60 for b in ids] for a in ids], dtype=np.int64)
+    insp = np.array([int(nd['insp_time']) for nd in nodes], dtype=np.int64)
+    ret = np.array([int(return_times.get(nid, 0)) // 60 for nid in ids], dtype=np.int64)
+    P = np.array([[idx[nid] for nid in tour] for tour in tours], dtype=np.int64)
+    mode, max_over, max_return_over, next_start = _vector_policy(policy)
+    work = WORK_LIMIT_HOURS * 60
+    M, n = P.shape
+
+    def decide(fin, basis, allowed):
+        over = fin > basis + work
+        if mode == 'overtime': return np.zeros(M, dtype=bool)
+        if mode == 'overnight': return over
+        return over & (fin - (basis + work) > allowed)
+
+    def next_basis(basis):
+        return (basis // 1440 + 1) * 1440 + next_start
+
+    basis = np.full(M, start_dt.hour * 60 + start_dt.minute, dtype=np.int64)
+    curr, day = basis.copy(), np.ones(M, dtype=np.int64)
+    overtime = np.zeros(M, dtype=np.int64)
+    arrival, finish, days = np.zeros((M, n), dtype=np.int64), np.zeros((M, n), dtype=np.int64), np.ones((M, n), dtype=np.int64)
+    arrival[:, 0] = finish[:, 0] = curr
+    for k in range(1, n):
+        mv, it = T[P[:, k - 1], P[:, k]], insp[P[:, k]]
+        fin = curr + mv + it
+        nxt = decide(fin, basis, max_over)
+        # 숙박: 그날의 연장근무를 정산하고 다음날 출발 시각부터 다시 이동
+        overtime += np.where(nxt, np.maximum(curr - (basis + work), 0), 0)
+        basis = np.where(nxt, next_basis(basis), basis)
+        day += nxt
+        start = np.where(nxt, basis, curr)
+        arrival[:, k], finish[:, k], days[:, k] = start + mv, start + mv + it, day
+        curr = finish[:, k]
+
+    # 복귀
+    rv = ret[P[:, -1]]
+    final = curr + rv
+    nxt = decide(final, basis, max_return_over)
+    overtime += np.where(nxt, np.maximum(curr - (basis + work), 0), np.maximum(final - (basis + work), 0))
+    basis = np.where(nxt, next_basis(basis), basis)
+    day += nxt
+    final = np.where(nxt, basis + rv, final)
+    travel = T[P[:, :-1], P[:, 1:]].sum(axis=1) + rv
+    return {'days': day, 'overnights': day - 1, 'overtime_min': overtime, 'final_min': final, 'travel_min': travel,
+            'arrival_min': arrival, 'finish_min': finish, 'day': days}
+
+def rank_schedules(tours, nodes, matrix, start_dt, policy, return_times):
+    # 사용 일수 → 연장근무 → 최종 도착 시각 → 총 이동시간 순으로 좋은 후보부터 (후보 색인 배열, 평가 결과)
+    import numpy as np
+    ev = evaluate_schedules(tours, nodes, matrix, start_dt, policy, return_times)
+    order = np.lexsort((ev['travel_min'], ev['final_min'], ev['overtime_min'], ev['days']))
+    return order, ev
+
+# ==========================================
+# 6. 배치(무인) 플래닝 모드
+# ==========================================
+# 작업 파일(JSON/YAML) 예시:
+# {
+#   "defaults": {"start_time": "09:00", "time_mode": "csv",
+#                "overtime_policy": {"mode": "limit", "max_overtime_minutes": 60, "next_day_start": "09:00"}},
+#   "plans": [
+#     {"plan_id": "teamA_1102", "start_date": "2026-11-02", "start_address": "...", "dest_address": "...",
+#      "bridges": ["가송2교", {"name": "가송1교(확장부)", "insp_type": "보수"}, {"id": 3}]}
+#   ]
+# }
+# - time_mode      : "csv" (교량별 일반/보수) 또는 "fixed" (fixed_minutes 일괄 적용)
+# - crews          : 점검팀 수 (2 이상이면 다중 점검팀 모드로 분할 계산, 기본 1)
+# - overtime_policy: mode = "overtime"(항상 연장근무) / "overnight"(항상 숙박) / "limit"(초과분이 max_overtime_minutes 이하면 연장근무)
+# - plan_id        : 결과 파일명으로 쓰이므로 문자/숫자/_/- 1~64자만 허용 (경로 문자 불가)
+BATCH_OUTPUT_DIR = "batch_results"
+BATCH_MAX_WORKERS = None   # None : CPU 코어 수만큼 작업자 프로세스 사용
+PLAN_ID_PATTERN = re.compile(r"[\w-]{1,64}")
+
+def is_valid_plan_id(plan_id):
+    return bool(PLAN_ID_PATTERN.fullmatch(plan_id))
+
+def load_job_file(job_file):
+    with open(job_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if job_file.lower().endswith(('.yaml', '.yml')):
+        try: import yaml
+        except ImportError:
+            raise RuntimeError("YAML 작업 파일을 읽으려면 PyYAML이 필요합니다. (pip install pyyaml)")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    defaults = data.get('defaults', {})
+    return [{**defaults, **plan} for plan in data.get('plans', [])]
+
+def parse_hhmm(t_str):
+    h, m = map(int, str(t_str).strip().split(':'))
+    return datetime.time(h, m)
+
+def find_bridge_row(df, spec):
+    if 'id' in spec:
+        rows = df[df['ID'].astype(str) == str(spec['id'])]
+    else:
+        name = spec['name']
+        rows = df[df['name'] == name]
+        if rows.empty: rows = df[df['name'].str.contains(name, regex=False)]
+        if len(rows) > 1 and spec.get('address'):
+            rows = rows[rows['address'].astype(str).str.contains(spec['address'], regex=False)]
+    if rows.empty: raise ValueError(f"교량 검색 실패: {spec}")
+    if len(rows) > 1: raise ValueError(f"교량이 {len(rows)}개 검색됨 (id 또는 address로 지정 필요): {spec}")
+    return rows.iloc[0]
+
+def resolve_batch_plan(plan, df, geo_cache):
+    def geocode(addr):
+        if addr not in geo_cache: geo_cache[addr] = get_coordinate(addr)
+        return geo_cache[addr]
+
+    plan_id = str(plan['plan_id'])
+    if not is_valid_plan_id(plan_id): raise ValueError(f"plan_id 형식 오류 (문자/숫자/_/- 1~64자): {plan_id!r}")
+    start_addr = plan.get('start_address') or OFFICE_ADDRESS
+    start_name = plan.get('start_name') or ("사용자 지정(출발)" if plan.get('start_address') else OFFICE_NAME)
+    start_coord = geocode(start_addr)
+    if not start_coord: raise ValueError(f"출발지 좌표 변환 실패: {start_addr}")
+
+    dest_addr = plan.get('dest_address')
+    dest_name, dest_coord = (dest_addr, geocode(dest_addr)) if dest_addr else (OFFICE_NAME, None)
+    if not dest_coord: dest_name, dest_coord = OFFICE_NAME, geocode(OFFICE_ADDRESS)
+
+    start_dt = datetime.datetime.strptime(f"{plan['start_date']} {plan.get('start_time', '09:00')}", "%Y-%m-%d %H:%M")
+    policy = plan.get('overtime_policy', {})
+    RulePolicy.from_dict(policy)   # 정책 형식 사전 검증
+
+    time_mode = str(plan.get('time_mode', 'csv'))
+    fixed_minutes = int(plan.get('fixed_minutes', 60))
+    nodes = [{'id': 0, 'name': start_name, 'coord': start_coord, 'insp_time': 0, 'insp_type': '출발'}]
+    for spec in plan.get('bridges', []):
+        if isinstance(spec, str): spec = {'name': spec}
+        d = find_bridge_row(df, spec)
+        if time_mode in ('fixed', '2'): it = fixed_minutes; ity = f"일괄({fixed_minutes}분)"
+        elif str(spec.get('insp_type', '일반')) in ('보수', '보수점검', 'hard', '2'): it = int(d['inspection_hard']); ity = "보수점검"
+        else: it = int(d['inspection_basic']); ity = "일반점검"
+        nodes.append(make_bridge_node(len(nodes), d, it, ity))
+    if len(nodes) < 2: raise ValueError("점검할 교량이 없습니다.")
+
+    return {'plan_id': plan_id, 'nodes': nodes, 'start_dt': start_dt, 'crews': int(plan.get('crews', 1)),
+            'dest_name': dest_name, 'dest_coord': dest_coord, 'overtime_policy': policy,
+            'time_mode': time_mode, 'fixed_minutes': fixed_minutes}
+
+@METRICS.timed('matrix.prefetch')
+def prefetch_batch_routes(jobs):
+    # 모든 계획의 O-D 쌍 + 복귀 구간을 중복 없이 모아 한 번에 수집 (작업자 프로세스는 캐시만 읽음)
+    import concurrent.futures
+    route_cache = get_route_cache()
+    tasks = {}
+    for job in jobs:
+        coords = [n['coord'] for n in job['nodes']]
+        dt_str = job['start_dt'].strftime("%Y%m%d%H%M")
+        pairs = [(a, b) for a in coords for b in coords if a != b] + [(c, job['dest_coord']) for c in coords[1:]]
+        for a, b in pairs:
+            key = f"{a}|{b}"
+            if a != b and key not in route_cache and key not in tasks: tasks[key] = (a, b, dt_str)
+
+    print(f"\n   📡 [공유 데이터 수집] 전체 계획 통합 신규 요청: {len(tasks)}건")
+    if not tasks: return
+    completed = 0
+    progress = Progress('matrix.prefetch', len(tasks), "API 다운로드 진행률")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(get_kakao_route_data, *t) for t in tasks.values()]
+        for _ in concurrent.futures.as_completed(futures):
+            completed += 1
+            progress.update(completed)
+    progress.finish()
+    save_cache(get_route_cache())
+
+def _batch_worker_init(shared_cache):
+    global route_cache, CACHE_READ_ONLY
+    route_cache = shared_cache
+    CACHE_READ_ONLY = True
+
+def solve_plan_crews(nodes, matrix, num_crews, parallel=True, start_dt=None, dest_coord=None, overtime_policy=None):
+    # start_dt가 주어지면 계획 결과 캐시(10절) 사용: 동일 인스턴스는 즉시 반환, 유사 인스턴스는 warm-start
+    # start_dt + dest_coord가 주어지면 단일 팀 배틀은 일정 평가(5-3절)로 최종 경로 선택 (overtime_policy 없으면 숙박 가정)
+    use_cache = PLAN_CACHE_ENABLED and start_dt and plan_cache_usable(nodes)
+    fingerprint = plan_fingerprint(nodes, matrix, num_crews, start_dt, dest_coord, overtime_policy) if use_cache else None
+    if fingerprint:
+        crews = load_cached_plan(fingerprint, nodes)
+        if crews: return crews
+
+    if num_crews > 1:
+        crews, _ = solve_multi_crew(nodes, matrix, num_crews, parallel=parallel)
+    else:
+        initial_path = find_warm_start(nodes, matrix) if fingerprint else None
+        schedule = None
+        if start_dt and dest_coord:
+            schedule = {'start_dt': start_dt, 'return_times': schedule_return_times(nodes, dest_coord, matrix),
+                        'policy': RulePolicy.from_dict(overtime_policy) if overtime_policy is not None else None}
+        winner_path, winner_name, battle = run_battle(nodes, matrix, initial_path, schedule)
+        crews = [{'path': winner_path, 'winner': winner_name, 'battle': battle}]
+    if fingerprint: store_cached_plan(fingerprint, nodes, matrix, crews)
+    return crews
+
+def write_plan_result(job, crews, output_dir, matrix=None, verbose=True, inline_data=True):
+    # inline_data: 리포트를 파일로 직접 열어도 경로가 보이도록 경로 데이터를 HTML에도 넣음 (HTTP로만 제공하는 서비스는 False)
+    # 팀별 일정 시뮬레이션 → HTML 리포트 → <plan_id>.json 저장
+    plan_id = job['plan_id']
+    node_map = {n['id']: n for n in job['nodes']}
+    policy = RulePolicy.from_dict(job['overtime_policy'], verbose=verbose)
+    crew_results = []
+    for c, crew in enumerate(crews):
+        base_name = plan_id if len(crews) == 1 else f"{plan_id}_crew{c + 1}"
+        html_path = os.path.join(output_dir, f"{base_name}.html")
+        sorted_nodes = [node_map[nid] for nid in crew['path']]
+        map_log, visited_info = simulate_schedule(sorted_nodes, job['start_dt'], job['dest_name'], job['dest_coord'], policy, matrix)
+        print_schedule_summary(visited_info)
+        generate_kakao_map_html(map_log, visited_info, crew['winner'], html_file=html_path, inline_data=inline_data)
+        crew_results.append({
+            'winner': crew['winner'], 'battle': crew['battle'],
+            'order': [n['name'] for n in sorted_nodes], 'total_days': visited_info[-1]['day'],
+            'schedule': visited_info, 'report_html': os.path.abspath(html_path),
+        })
+        if matrix is not None:
+            # 증분 재계획(--replan)용 상태: 팀별 방문 순서 + 소요시간 행렬
+            state_path = os.path.join(output_dir, f"{base_name}.state.json")
+            save_plan_state(state_path, {**job, 'plan_id': base_name, 'nodes': sorted_nodes, 'crews': 1}, crew['path'], matrix)
+            crew_results[-1]['state_file'] = os.path.abspath(state_path)
+
+    result = {'plan_id': plan_id, 'status': 'ok'}
+    if len(crew_results) == 1: result.update(crew_results[0])
+    else:
+        result.update({'winner': f"Multi-Crew x{len(crew_results)}", 'total_days': max(c['total_days'] for c in crew_results),
+                       'crews': [{'crew': c + 1, **res} for c, res in enumerate(crew_results)]})
+    with open(os.path.join(output_dir, f"{plan_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=4)
+    return result
+
+def run_batch_plan(job, output_dir):
+    METRICS.reset()   # 작업자 프로세스는 여러 계획을 처리하므로 계획마다 계측 초기화
+    with open(os.path.join(output_dir, f"{job['plan_id']}.log"), 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log), progress_to(LogProgress()):
+        print_separator(f"배치 계획: {job['plan_id']}")
+        matrix = build_od_matrix(job['nodes'], job['start_dt'].strftime("%Y%m%d%H%M"))
+        # 계획 단위로 이미 병렬 실행 중이므로 팀별 계산은 작업자 안에서 순차 처리
+        crews = solve_plan_crews(job['nodes'], matrix, job['crews'], parallel=False, start_dt=job['start_dt'], dest_coord=job['dest_coord'], overtime_policy=job['overtime_policy'])
+        result = write_plan_result(job, crews, output_dir, matrix)
+    if METRICS_ENABLED: METRICS.dump(os.path.join(output_dir, f"{job['plan_id']}.metrics.json"))
+    return result
+
+def write_batch_error(output_dir, plan_id, error):
+    result = {'plan_id': plan_id, 'status': 'error', 'error': str(error)}
+    with open(os.path.join(output_dir, f"{plan_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=4)
+    return result
+
+def run_batch(job_file, output_dir=BATCH_OUTPUT_DIR, max_workers=BATCH_MAX_WORKERS):
+    import concurrent.futures
+    print_separator(f"배치 플래닝 모드 ({job_file})")
+    df = load_bridge_csv()
+    if df is None:
+        print(f"   ❌ 오류: '{CSV_FILE_NAME}' 파일을 읽을 수 없습니다.")
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 1. 작업 해석 (좌표 변환 / 교량 검색은 부모 프로세스에서 한 번만 수행)
+    plans = load_job_file(job_file)
+    jobs, results, geo_cache = [], [], {}
+    for idx, plan in enumerate(plans):
+        plan_id = str(plan.get('plan_id', f"plan_{idx + 1}"))
+        try: jobs.append(resolve_batch_plan({**plan, 'plan_id': plan_id}, df, geo_cache))
+        except Exception as e:
+            print(f"   ❌ [{plan_id}] 작업 해석 실패: {e}")
+            results.append(write_batch_error(output_dir, plan_id if is_valid_plan_id(plan_id) else f"plan_{idx + 1}", e))
+    if not jobs: return results
+
+    # 2. 공유 캐시 채우기 → 3. 프로세스 풀에서 계획별 병렬 계산
+    prefetch_batch_routes(jobs)
+    print(f"\n   🧮 [병렬 계산] {len(jobs)}개 계획 실행 중...")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_batch_worker_init, initargs=(get_route_cache(),)) as executor:
+        future_to_id = {executor.submit(run_batch_plan, job, output_dir): job['plan_id'] for job in jobs}
+        for future in concurrent.futures.as_completed(future_to_id):
+            plan_id = future_to_id[future]
+            try:
+                res = future.result()
+                print(f"      ✅ [{plan_id}] {res['winner']} | 총 {res['total_days']}일")
+            except Exception as e:
+                print(f"      ❌ [{plan_id}] 계산 실패: {e}")
+                res = write_batch_error(output_dir, plan_id, e)
+            results.append(res)
+
+    print(f"\n   📁 결과 저장 위치: {os.path.abspath(output_dir)}")
+    if METRICS_ENABLED: METRICS.dump(os.path.join(output_dir, "batch.metrics.json"))
+    return results
+
+# ==========================================
+# 7. 다중 점검팀(Multi-Crew) 모드
+# ==========================================
+# 교량을 K개 팀에 (이동 + 점검시간) 작업량 기준으로 균형 분할 → 팀별 Route A/B/C 배틀 병렬 실행 → 경계 교량 재배치
+CREW_LOAD_TOLERANCE = 1.15    # 분할 시 팀별 허용 작업량 = 평균 작업량 x 1.15
+CREW_REBALANCE_ROUNDS = 30    # 경계 교량 재배치 최대 횟수
+
+def _sym_time(matrix, a, b):
+    # 비대칭 소요시간의 왕복 평균 (군집화용 거리)
+    return (matrix.get((a, b), {}).get('time', float('inf')) + matrix.get((b, a), {}).get('time', float('inf'))) / 2
+
+def _balanced_assign(bridge_ids, medoids, insp_sec, matrix):
+    k = len(medoids)
+    clusters = [[m] for m in medoids]
+    loads = [insp_sec[m] for m in medoids]
+    rest = [b for b in bridge_ids if b not in medoids]
+    cost = {b: [_sym_time(matrix, m, b) for m in medoids] for b in rest}
+    cap = (sum(insp_sec.values()) + sum(min(c) for c in cost.values())) / k * CREW_LOAD_TOLERANCE
+
+    # regret 순서: 1순위/2순위 팀의 거리 차이가 큰(애매하지 않은) 교량부터 배정
+    def regret(b):
+        c = sorted(cost[b])
+        return c[1] - c[0] if k > 1 else 0
+
+    for b in sorted(rest, key=regret, reverse=True):
+        order = sorted(range(k), key=lambda c: cost[b][c])
+        c = next((c for c in order if loads[c] + insp_sec[b] + cost[b][c] <= cap), min(range(k), key=lambda c: loads[c]))
+        clusters[c].append(b)
+        loads[c] += insp_sec[b] + cost[b][c]
+    return clusters
+
+def partition_bridges(nodes, matrix, num_crews, start_node_id=0):
+    insp_sec = {n['id']: n['insp_time'] * 60 for n in nodes if n['id'] != start_node_id}
+    bridge_ids = list(insp_sec)
+    num_crews = max(1, min(num_crews, len(bridge_ids)))
+
+    # 초기 중심: 출발지에서 가장 먼 교량부터 farthest-first
+    medoids = [max(bridge_ids, key=lambda b: _sym_time(matrix, start_node_id, b))]
+    while len(medoids) < num_crews:
+        medoids.append(max((b for b in bridge_ids if b not in medoids), key=lambda b: min(_sym_time(matrix, m, b) for m in medoids)))
+
+    # 균형 배정 ↔ 중심(medoid) 갱신 반복
+    for _ in range(10):
+        clusters = _balanced_assign(bridge_ids, medoids, insp_sec, matrix)
+        new_medoids = [min(c, key=lambda a: sum(_sym_time(matrix, a, b) for b in c)) for c in clusters]
+        if new_medoids == medoids: break
+        medoids = new_medoids
+    return clusters
+
+def strip_matrix_paths(matrix, ids=None):
+    # 프로세스 간 전달용: 경로 좌표를 뺀 소요시간 행렬
+    if ids is None: return {k: {'time': v['time']} for k, v in matrix.items()}
+    return {(a, b): {'time': matrix[(a, b)]['time']} for a in ids for b in ids if (a, b) in matrix}
+
+def crew_workload(path, matrix, node_map):
+    return calculate_total_duration(path, matrix) + sum(node_map[nid]['insp_time'] * 60 for nid in path)
+
+def rebalance_crew_tours(tours, matrix, node_map, rounds=CREW_REBALANCE_ROUNDS):
+    # 가장 바쁜 팀의 교량 중, 다른 팀 경로에 끼워넣을 때 최대 작업량이 줄어드는 교량(경계 교량)을 이동
+    def t(a, b): return matrix.get((a, b), {}).get('time', float('inf'))
+    tours = [p[:] for p in tours]
+    changed = set()
+    for _ in range(rounds):
+        loads = [crew_workload(p, matrix, node_map) for p in tours]
+        src = max(range(len(tours)), key=lambda c: loads[c])
+        sp = tours[src]
+        if len(sp) <= 2: break
+        best = None
+        for pos in range(1, len(sp)):
+            b = sp[pos]
+            prev, nxt = sp[pos - 1], sp[(pos + 1) % len(sp)]
+            src_load = loads[src] - (t(prev, b) + t(b, nxt) - t(prev, nxt)) - node_map[b]['insp_time'] * 60
+            for dst, dp in enumerate(tours):
+                if dst == src: continue
+                ins_cost, ins_pos = min((t(dp[i], b) + t(b, dp[(i + 1) % len(dp)]) - t(dp[i], dp[(i + 1) % len(dp)]), i + 1) for i in range(len(dp)))
+                dst_load = loads[dst] + ins_cost + node_map[b]['insp_time'] * 60
+                new_max = max([src_load, dst_load] + [loads[c] for c in range(len(tours)) if c not in (src, dst)])
+                if new_max < loads[src] and (best is None or new_max < best[0]):
+                    best = (new_max, pos, dst, ins_pos)
+        if best is None: break
+        _, pos, dst, ins_pos = best
+        tours[dst].insert(ins_pos, sp.pop(pos))
+        changed.update((src, dst))
+
+    for c in changed:
+        tours[c] = run_deterministic_3opt(tours[c], matrix)
+    return tours, len(changed) > 0
+
+def _solve_crew(sub_nodes, sub_matrix, in_worker=False):
+    # in_worker: 작업자 프로세스 실행 → 이 팀의 계측만 모아 돌려줌 (부모에서 METRICS.merge)
+    if in_worker: METRICS.reset()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), progress_to(LogProgress()):
+        winner_path, winner_name, battle = run_battle(sub_nodes, sub_matrix)
+    return winner_path, winner_name, battle, buf.getvalue(), METRICS.summary() if in_worker else None
+
+@METRICS.timed('solve.multi_crew')
+def solve_multi_crew(nodes, matrix, num_crews, start_node_id=0, parallel=True, max_workers=None):
+    import concurrent.futures
+    print(f"   👥 [Multi-Crew] 교량 {len(nodes) - 1}개를 {num_crews}개 팀으로 분할 중...")
+    start_time = time.time()
+    node_map = {n['id']: n for n in nodes}
+    clusters = partition_bridges(nodes, matrix, num_crews, start_node_id)
+
+    # 작업자 프로세스로는 경로 좌표를 뺀 부분 행렬만 전달
+    jobs = []
+    for c in clusters:
+        ids = [start_node_id] + c
+        jobs.append(([node_map[i] for i in ids], strip_matrix_paths(matrix, ids)))
+    for c, (sub_nodes, _) in enumerate(jobs):
+        print(f"      ▶ 팀 {c + 1}: 교량 {len(sub_nodes) - 1}개")
+
+    if parallel and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers or len(jobs)) as executor:
+            results = list(executor.map(_solve_crew, *zip(*jobs), [True] * len(jobs)))
+        for r in results: METRICS.merge(r[4])
+    else:
+        results = [_solve_crew(*job) for job in jobs]
+
+    # 팀별 배틀 출력은 작업자에서 모아 두었다가 팀 순서대로 출력 (병렬 실행 시 섞이지 않도록)
+    for c, r in enumerate(results):
+        print(f"\n   ── 팀 {c + 1} 배틀 ──")
+        print(r[3].rstrip())
+    for c, (_, winner_name, battle, _, _) in enumerate(results):
+        costs = " / ".join(f"{key[-1].upper()} {int(b['cost_sec']/60)}분" for key, b in battle.items() if key.startswith('route_'))
+        print(f"      ✅ 팀 {c + 1}: {winner_name} | {costs}")
+
+    tours, moved = rebalance_crew_tours([r[0] for r in results], matrix, node_map)
+    if moved: print(f"      🔁 경계 교량 재배치 완료")
+    crews = [{'path': tours[c], 'winner': results[c][1], 'battle': results[c][2]} for c in range(len(results))]
+    for c, crew in enumerate(crews):
+        print(f"      👷 팀 {c + 1}: 교량 {len(crew['path']) - 1}개 | 작업량 {int(crew_workload(crew['path'], matrix, node_map)/60)}분")
+    elapsed_time = time.time() - start_time
+    return crews, elapsed_time
+
+# ==========================================
+# 8. 상주 플래닝 서비스 (REST API)
+# ==========================================
+# 교량 CSV, 좌표/경로 캐시, O-D 행렬을 메모리에 유지한 채 계획 요청을 처리
+#   POST /plans                 : 계획 등록 (배치 작업 파일의 plan 1개와 같은 형식) → 202
+#   GET  /plans                 : 전체 계획 상태 목록
+#   GET  /plans/<id>            : 계획 상태 / 결과(JSON)
+#   GET  /plans/<id>/report     : HTML 리포트 (다중 점검팀은 ?crew=<번호>)
+#   GET  /metrics               : 계측 결과 (단계별 시간, API 지연, 캐시 적중률)
+#   GET  /health                : 서비스 상태
+SERVICE_PORT = 8100
+SERVICE_OUTPUT_DIR = "service_results"
+SERVICE_QUEUE_SIZE = 32       # 대기열 최대 길이 (초과 시 503)
+SERVICE_WORKERS = 2           # 동시에 계산할 계획 수 (solver 프로세스 수)
+SERVICE_MATRIX_CACHE = 64     # 메모리에 유지할 O-D 행렬 수
+SERVICE_JOB_HISTORY = 500     # 상태 조회용으로 유지할 완료(done/error) 계획 수 (초과 시 오래된 것부터 제거)
+
+def _solve_plan_worker(nodes, time_matrix, num_crews, start_dt=None, dest_coord=None, overtime_policy=None):
+    # 작업자 프로세스는 여러 계획을 처리하므로 계획마다 계측 초기화 → 결과와 함께 돌려줘 서비스 /metrics에 합산
+    METRICS.reset()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), progress_to(NullProgress()):
+        crews = solve_plan_crews(nodes, time_matrix, num_crews, parallel=False, start_dt=start_dt, dest_coord=dest_coord, overtime_policy=overtime_policy)
+    return crews, buf.getvalue(), METRICS.summary()
+
+class PlanningService:
+    def __init__(self, output_dir=SERVICE_OUTPUT_DIR, queue_size=SERVICE_QUEUE_SIZE, workers=SERVICE_WORKERS):
+        import concurrent.futures
+        self.df = load_bridge_csv()
+        if self.df is None: raise RuntimeError(f"'{CSV_FILE_NAME}' 파일을 읽을 수 없습니다.")
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.geo_cache = {}
+        self.matrices = {}        # 좌표 튜플 → O-D 행렬 (오래된 것부터 제거)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.fetch_lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        for _ in range(workers):
+            threading.Thread(target=self._worker_loop, daemon=True).start()
+
+    def submit(self, plan):
+        if not isinstance(plan, dict): return 400, {'status': 'error', 'error': "요청 본문은 JSON 객체여야 합니다."}
+        plan_id = str(plan.get('plan_id') or uuid.uuid4().hex[:12])
+        if not is_valid_plan_id(plan_id):
+            return 400, {'plan_id': plan_id, 'status': 'error', 'error': "plan_id는 문자/숫자/_/- 1~64자만 사용할 수 있습니다."}
+        # 좌표 변환 전에 plan_id를 먼저 예약 (동시에 들어온 같은 plan_id 요청은 409) → 실패하면 이전 상태로 복원
+        with self.lock:
+            previous = self.jobs.get(plan_id)
+            if (previous or {}).get('status') in ('queued', 'running'):
+                return 409, {'plan_id': plan_id, 'status': 'error', 'error': "같은 plan_id의 계획이 이미 처리 중입니다."}
+            self.jobs[plan_id] = {'plan_id': plan_id, 'status': 'queued', 'submitted_at': time.time()}
+
+        def release():
+            with self.lock:
+                if previous is None: self.jobs.pop(plan_id, None)
+                else: self.jobs[plan_id] = previous
+
+        try: job = resolve_batch_plan({**plan, 'plan_id': plan_id}, self.df, self.geo_cache)
+        except Exception as e:
+            release()
+            error = f"missing field: {e.args[0]}" if isinstance(e, KeyError) else str(e)
+            return 400, {'plan_id': plan_id, 'status': 'error', 'error': error}
+        try: self.queue.put_nowait(job)
+        except queue.Full:
+            release()
+            return 503, {'plan_id': plan_id, 'status': 'error', 'error': "대기열이 가득 찼습니다."}
+        return 202, {'plan_id': plan_id, 'status': 'queued'}
+
+    def status(self, plan_id=None):
+        with self.lock:
+            if plan_id is None: return [{k: v for k, v in j.items() if k != 'result'} for j in self.jobs.values()]
+            return self.jobs.get(plan_id)
+
+    def get_matrix(self, job):
+        key = tuple(n['coord'] for n in job['nodes'])
+        with self.fetch_lock:
+            if key in self.matrices: return self.matrices[key]
+            prefetch_batch_routes([job])
+            matrix = build_od_matrix(job['nodes'], job['start_dt'].strftime("%Y%m%d%H%M"))
+            self.matrices[key] = matrix
+            while len(self.matrices) > SERVICE_MATRIX_CACHE: self.matrices.pop(next(iter(self.matrices)))
+            return matrix
+
+    def _worker_loop(self):
+        while True:
+            job = self.queue.get()
+            plan_id = job['plan_id']
+            with self.lock: self.jobs[plan_id].update({'status': 'running', 'started_at': time.time()})
+            try:
+                matrix = self.get_matrix(job)
+                future = self.pool.submit(_solve_plan_worker, job['nodes'], strip_matrix_paths(matrix), job['crews'], job['start_dt'], job['dest_coord'], job['overtime_policy'])
+                crews, _, metrics = future.result()
+                METRICS.merge(metrics)
+                result = write_plan_result(job, crews, self.output_dir, matrix, verbose=False, inline_data=False)
+                update = {'status': 'done', 'result': result}
+            except Exception as e:
+                update = {'status': 'error', 'error': str(e)}
+            with self.lock:
+                self.jobs[plan_id].update({**update, 'finished_at': time.time()})
+                self._prune_jobs()
+            self.queue.task_done()
+
+    def _prune_jobs(self):
+        # 완료된 계획은 최근 SERVICE_JOB_HISTORY개만 유지 (대기/실행 중인 계획은 제거하지 않음) — self.lock 안에서 호출
+        finished = [j for j in self.jobs.values() if j['status'] in ('done', 'error')]
+        if len(finished) <= SERVICE_JOB_HISTORY: return
+        finished.sort(key=lambda j: j.get('finished_at', 0))
+        for j in finished[:len(finished) - SERVICE_JOB_HISTORY]: del self.jobs[j['plan_id']]
+
+def make_service_handler(service):
+    import http.server
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _send(self, code, body, content_type='application/json; charset=utf-8'):
+            data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/plans': return self._send(404, {'error': 'not found'})
+            try: plan = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except ValueError: return self._send(400, {'error': "JSON 형식 오류"})
+            code, body = service.submit(plan)
+            self._send(code, body)
+
+        def do_GET(self):
+            path, _, query = self.path.partition('?')
+            parts = [p for p in path.split('/') if p]
+            if parts == ['metrics']: return self._send(200, METRICS.summary())
+            if parts == ['health']:
+                return self._send(200, {'status': 'ok', 'queued': service.queue.qsize(), 'jobs': len(service.jobs)})
+            if parts == ['plans']: return self._send(200, service.status())
+            if len(parts) < 2 or parts[0] != 'plans': return self._send(404, {'error': 'not found'})
+            job = service.status(parts[1])
+            if job is None: return self._send(404, {'error': 'unknown plan_id'})
+            if len(parts) == 2: return self._send(200, job)
+            if len(parts) == 3 and parts[2].startswith(parts[1]) and parts[2].endswith('.data.json'):
+                data_path = os.path.join(service.output_dir, os.path.basename(parts[2]))
+                if os.path.exists(data_path):
+                    with open(data_path, 'rb') as f: return self._send(200, f.read())
+            if len(parts) != 3 or parts[2] != 'report': return self._send(404, {'error': 'not found'})
+            if job['status'] == 'done':
+                result = job['result']
+                report = result.get('report_html')
+                if 'crews' in result:
+                    crew = int(dict(q.split('=', 1) for q in query.split('&') if '=' in q).get('crew', 1))
+                    report = result['crews'][min(max(crew, 1), len(result['crews'])) - 1]['report_html']
+                with open(report, 'rb') as f: return self._send(200, f.read(), 'text/html; charset=utf-8')
+            self._send(404, {'error': "리포트가 아직 준비되지 않았습니다.", 'status': job['status']})
+
+        def log_message(self, format, *args): pass
+
+    return Handler
+
+def run_service(port=SERVICE_PORT, output_dir=SERVICE_OUTPUT_DIR, workers=SERVICE_WORKERS):
+    print_separator("상주 플래닝 서비스")
+    service = PlanningService(output_dir, workers=workers)
+    print(f"   🌐 http://127.0.0.1:{port} 에서 계획 요청 대기 중... (Ctrl+C 종료)")
+    import http.server
+    with http.server.ThreadingHTTPServer(("127.0.0.1", port), make_service_handler(service)) as httpd:
+        try: httpd.serve_forever()
+        except KeyboardInterrupt: pass
+    service.pool.shutdown(cancel_futures=True)
+    save_cache(get_route_cache())
+
+# ==========================================
+# 9. 증분 재계획 (교량 추가/삭제)
+# ==========================================
+# 기존 계획(방문 순서 + 행렬)에 새 교량의 행/열만 받아 최소비용 삽입 → 변경 위치 주변만 국소 개선
+REPLAN_REPAIR_RADIUS = 4      # 변경 위치 앞뒤로 국소 개선할 범위 (방문 순서 기준)
+REPLAN_TIME_LIMIT = 0.5       # 국소 개선 시간 예산 (초)
+
+def save_plan_state(path, job, tour, matrix):
+    state = {
+        'plan_id': job['plan_id'], 'start_dt': job['start_dt'].strftime("%Y-%m-%d %H:%M"),
+        'dest_name': job['dest_name'], 'dest_coord': job['dest_coord'],
+        'overtime_policy': job.get('overtime_policy', {}),
+        'time_mode': job.get('time_mode', 'csv'), 'fixed_minutes': job.get('fixed_minutes', 60),
+        'nodes': job['nodes'], 'tour': tour,
+        'matrix': {f"{a}|{b}": matrix[(a, b)]['time'] for a in tour for b in tour if (a, b) in matrix},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, default=str)
+
+def load_plan_state(path):
+    with open(path, 'r', encoding='utf-8') as f: state = json.load(f)
+    matrix = {}
+    for key, sec in state.pop('matrix').items():
+        a, b = key.split('|')
+        matrix[(int(a), int(b))] = {'time': sec, 'path': []}
+    tour = state.pop('tour')
+    job = {**state, 'start_dt': datetime.datetime.strptime(state['start_dt'], "%Y-%m-%d %H:%M"), 'crews': 1}
+    return job, tour, matrix
+
+def cheapest_insertion(tour, new_ids, matrix):
+    def t(a, b): return matrix.get((a, b), {}).get('time', float('inf'))
+    tour = tour[:]
+    remaining = list(new_ids)
+    while remaining:
+        best = None
+        for nid in remaining:
+            for i in range(len(tour)):
+                a, b = tour[i], tour[(i + 1) % len(tour)]
+                delta = t(a, nid) + t(nid, b) - t(a, b)
+                if best is None or delta < best[0]: best = (delta, nid, i + 1)
+        _, nid, pos = best
+        tour.insert(pos, nid)
+        remaining.remove(nid)
+    return tour
+
+def repair_tour_window(tour, matrix, center_ids, radius=REPLAN_REPAIR_RADIUS, deadline=None):
+    # center_ids 주변 구간에서만 구간 뒤집기(2-opt)와 1~3개 교량 이동(or-opt)을 개선이 없을 때까지 반복
+    current = tour[:]
+    current_cost = calculate_total_duration(current, matrix)
+    improved = True
+    while improved and not (deadline and time.time() > deadline):
+        improved = False
+        n = len(current)
+        window = sorted({p for idx, nid in enumerate(current) if nid in center_ids for p in range(max(1, idx - radius), min(n, idx + radius + 1))})
+        candidates = []
+        for a_idx, i in enumerate(window):
+            for j in window[a_idx + 1:]:
+                candidates.append(current[:i] + current[i:j + 1][::-1] + current[j + 1:])
+            for seg_len in (1, 2, 3):
+                if i + seg_len > n: continue
+                seg, rest = current[i:i + seg_len], current[:i] + current[i + seg_len:]
+                for k in window:
+                    if k == i or k > len(rest) or k < 1: continue
+                    candidates.append(rest[:k] + seg + rest[k:])
+        for cand in candidates:
+            cost = calculate_total_duration(cand, matrix)
+            if cost < current_cost:
+                current, current_cost, improved = cand, cost, True
+                break
+    return current
+
+@METRICS.timed('replan')
+def replan_incremental(nodes, tour, matrix, add_nodes=(), remove_ids=(), start_datetime_str=None, time_limit=REPLAN_TIME_LIMIT):
+    # nodes/tour/matrix: 기존 계획, add_nodes: id 없는 새 교량 노드, remove_ids: 뺄 교량 id
+    start_time = time.time()
+    remove_ids = set(remove_ids) - {tour[0]}
+
+    # 1. 삭제: 빠진 교량의 앞/뒤 교량을 국소 개선 중심으로
+    centers = set()
+    for idx, nid in enumerate(tour):
+        if nid not in remove_ids: continue
+        prev = next((tour[k] for k in range(idx - 1, -1, -1) if tour[k] not in remove_ids), None)
+        nxt = next((tour[k] for k in range(idx + 1, len(tour)) if tour[k] not in remove_ids), None)
+        centers.update(x for x in (prev, nxt) if x is not None)
+    new_tour = [nid for nid in tour if nid not in remove_ids]
+    next_id = max(n['id'] for n in nodes) + 1
+    nodes = [n for n in nodes if n['id'] not in remove_ids]
+    matrix = {k: v for k, v in matrix.items() if k[0] not in remove_ids and k[1] not in remove_ids}
+
+    # 2. 추가: 새 교량의 행/열만 수집 후 최소비용 삽입
+    added = []
+    for spec in add_nodes:
+        nodes.append({**spec, 'id': next_id})
+        added.append(next_id)
+        next_id += 1
+    if added:
+        build_od_matrix(nodes, start_datetime_str, matrix, only_ids=set(added))
+        new_tour = cheapest_insertion(new_tour, added, matrix)
+        centers.update(added)
+
+    # 3. 변경 위치 주변만 국소 개선 (시간 예산은 새 행/열 수집이 끝난 뒤부터)
+    new_tour = repair_tour_window(new_tour, matrix, centers, deadline=time.time() + time_limit)
+    cost = calculate_total_duration(new_tour, matrix)
+    return nodes, new_tour, matrix, cost, time.time() - start_time
+
+def run_replan(state_file, add_names=(), remove_names=(), output_dir=None):
+    print_separator(f"증분 재계획 ({state_file})")
+    job, tour, matrix = load_plan_state(state_file)
+    output_dir = output_dir or os.path.dirname(os.path.abspath(state_file))
+    os.makedirs(output_dir, exist_ok=True)
+
+    add_nodes = []
+    if add_names:
+        df = load_bridge_csv()
+        if df is None: print(f"   ❌ 오류: '{CSV_FILE_NAME}' 파일을 읽을 수 없습니다."); return None
+        # 이미 계획에 있는 교량(이름+좌표 기준)은 다시 넣지 않음 — 점검 유형만 다른 경우도 동일 교량
+        planned = {(n['name'], n['coord']) for n in job['nodes']}
+        unknown, duplicated = [], []
+        for item in add_names:
+            # "교량명" 또는 "교량명:보수"
+            name, _, kind = item.partition(':')
+            try: d = find_bridge_row(df, {'name': name.strip()})
+            except ValueError as e: unknown.append(f"{name.strip()} ({e})"); continue
+            bridge = make_bridge_node(None, d, 0, '')
+            if (bridge['name'], bridge['coord']) in planned: duplicated.append(bridge['name']); continue
+            planned.add((bridge['name'], bridge['coord']))
+            if str(job['time_mode']) in ('fixed', '2'): it, ity = int(job['fixed_minutes']), f"일괄({job['fixed_minutes']}분)"
+            elif kind.strip() in ('보수', '보수점검', 'hard', '2'): it, ity = int(d['inspection_hard']), "보수점검"
+            else: it, ity = int(d['inspection_basic']), "일반점검"
+            add_nodes.append({k: v for k, v in make_bridge_node(None, d, it, ity).items() if k != 'id'})
+        if unknown: print(f"   ⚠️ 추가할 수 없는 교량: {', '.join(unknown)}")
+        if duplicated: print(f"   ⚠️ 이미 계획에 있는 교량 (추가 생략): {', '.join(duplicated)}")
+
+    name_to_id = {n['name']: n['id'] for n in job['nodes']}
+    missing = [name for name in remove_names if name not in name_to_id]
+    if missing: print(f"   ⚠️ 계획에 없는 교량: {', '.join(missing)}")
+    remove_ids = [name_to_id[name] for name in remove_names if name in name_to_id]
+
+    old_cost = calculate_total_duration(tour, matrix)
+    nodes, tour, matrix, cost, elapsed = replan_incremental(job['nodes'], tour, matrix, add_nodes, remove_ids, job['start_dt'].strftime("%Y%m%d%H%M"))
+    print(f"\n   ♻️ [재계획] 추가 {len(add_nodes)}건 / 삭제 {len(remove_ids)}건 → {int(old_cost/60)}분 ➔ {int(cost/60)}분 (계산소요: {elapsed*1000:.1f}ms)")
+
+    new_job = {**job, 'nodes': nodes}
+    crews = [{'path': tour, 'winner': "Incremental Re-plan", 'battle': {'replan': {'cost_sec': cost, 'solve_ms': elapsed * 1000}}}]
+    return write_plan_result(new_job, crews, output_dir, matrix)
+
+# ==========================================
+# 10. 계획 결과 캐시 (인스턴스 지문 기반)
+# ==========================================
+# 지문: 교량(CSV ID/이름/좌표/점검시간) + 출발/도착 + 출발시각 버킷 + 팀 수 + 소요시간 행렬
+# 교량은 출발지를 제외하고 정렬해 해시하므로 입력 순서만 다른 요청도 같은 지문이 됨
+# 교량 키가 겹치는 요청(ID 없는 중복 교량 등)은 결과를 노드로 되돌릴 수 없으므로 캐시를 쓰지 않음
+PLAN_CACHE_ENABLED = True
+PLAN_CACHE_DIR = "plan_cache"
+PLAN_CACHE_MAX_ENTRIES = 200      # 초과 시 가장 오래 사용되지 않은 결과부터 삭제
+PLAN_CACHE_WARM_OVERLAP = 0.8     # 교량 구성이 이 비율 이상 겹치는 이전 결과로 warm-start
+
+def _node_key(node):
+    prefix = f"{node['bridge_id']}:" if node.get('bridge_id') is not None else ""
+    return f"{prefix}{node['name']}@{node['coord']}#{node['insp_time']}"
+
+def _canonical_nodes(nodes):
+    return [nodes[0]] + sorted(nodes[1:], key=lambda n: (n['coord'], n['name'], n['insp_time'], n.get('bridge_id') or ""))
+
+def plan_cache_usable(nodes):
+    keys = [_node_key(n) for n in nodes]
+    if len(set(keys)) == len(keys): return True
+    METRICS.count('plan_cache.key_collision')
+    print("   ⚠️ [계획 캐시] 구분되지 않는 교량이 있어 계획 캐시를 사용하지 않습니다.")
+    return False
+
+def plan_fingerprint(nodes, matrix, num_crews, start_dt, dest_coord, overtime_policy=None):
+    canon = _canonical_nodes(nodes)
+    payload = {
+        'nodes': [_node_key(n) for n in canon], 'dest': dest_coord, 'crews': num_crews, 'policy': overtime_policy,
+        'departure': departure_bucket(start_dt),
+        'matrix': [[matrix.get((a['id'], b['id']), {}).get('time') for b in canon] for a in canon],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_cached_plan(fingerprint, nodes):
+    path = os.path.join(PLAN_CACHE_DIR, f"{fingerprint}.json")
+    try:
+        with open(path, 'r', encoding='utf-8') as f: entry = json.load(f)
+        os.utime(path)   # 최근 사용 시각 갱신 (제거 순서 기준)
+    except (OSError, ValueError):
+        METRICS.count('plan_cache.miss')
+        return None
+    # 캐시에는 교량 키 순서로 저장 → 현재 요청의 노드 id로 복원
+    id_of = {_node_key(n): n['id'] for n in nodes}
+    METRICS.count('plan_cache.hit')
+    print(f"   ⚡ [계획 캐시] 동일한 계획 결과를 재사용합니다. ({fingerprint[:12]})")
+    return [{'path': [id_of[k] for k in crew['tour']], 'winner': crew['winner'], 'battle': crew['battle'], 'cached': True}
+            for crew in entry['crews']]
+
+def store_cached_plan(fingerprint, nodes, matrix, crews):
+    key_of = {n['id']: _node_key(n) for n in nodes}
+    entry = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'start': key_of[nodes[0]['id']], 'node_keys': sorted(key_of.values()),
+        'cost_sec': sum(calculate_total_duration(c['path'], matrix) for c in crews),
+        'crews': [{'tour': [key_of[nid] for nid in c['path']], 'winner': c['winner'], 'battle': c['battle']} for c in crews],
+    }
+    os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+    tmp_path = os.path.join(PLAN_CACHE_DIR, f"{fingerprint}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f: json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(PLAN_CACHE_DIR, f"{fingerprint}.json"))
+    evict_plan_cache()
+
+def evict_plan_cache(max_entries=PLAN_CACHE_MAX_ENTRIES):
+    files = [os.path.join(PLAN_CACHE_DIR, f) for f in os.listdir(PLAN_CACHE_DIR) if f.endswith('.json')]
+    if len(files) <= max_entries: return
+    files.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+    for path in files[:len(files) - max_entries]:
+        try: os.remove(path)
+        except OSError: pass   # 다른 작업자가 먼저 지운 경우
+    METRICS.count('plan_cache.evicted', len(files) - max_entries)
+
+def forget_cached_plans(coords):
+    # 위치 보정으로 좌표가 바뀐 교량이 들어간 결과는 지문이 달라져 다시 쓰이지 않으므로 삭제 (warm-start 후보에서도 제외)
+    if not os.path.isdir(PLAN_CACHE_DIR): return
+    marks = [f"@{c}#" for c in coords]
+    for fname in os.listdir(PLAN_CACHE_DIR):
+        if not fname.endswith('.json'): continue
+        path = os.path.join(PLAN_CACHE_DIR, fname)
+        try:
+            with open(path, 'r', encoding='utf-8') as f: entry = json.load(f)
+        except (OSError, ValueError): continue
+        if any(m in k for k in entry['node_keys'] for m in marks):
+            try: os.remove(path)
+            except OSError: pass
+            METRICS.count('plan_cache.invalidated')
+
+def find_warm_start(nodes, matrix):
+    # 출발지가 같고 교량 구성이 충분히 겹치는 단일 팀 결과 → 없는 교량은 빼고, 새 교량은 최소비용 삽입
+    if not os.path.isdir(PLAN_CACHE_DIR): return None
+    key_of = {_node_key(n): n['id'] for n in nodes}
+    start_key = _node_key(nodes[0])
+    best, best_overlap = None, PLAN_CACHE_WARM_OVERLAP
+    for fname in os.listdir(PLAN_CACHE_DIR):
+        if not fname.endswith('.json'): continue
+        try:
+            with open(os.path.join(PLAN_CACHE_DIR, fname), 'r', encoding='utf-8') as f: entry = json.load(f)
+        except (OSError, ValueError): continue
+        if entry.get('start') != start_key or len(entry['crews']) != 1: continue
+        common = len(set(entry['node_keys']) & set(key_of))
+        overlap = common / max(len(entry['node_keys']), len(key_of))
+        if overlap >= best_overlap: best, best_overlap = entry, overlap
+    if best is None: return None
+
+    tour = [key_of[k] for k in best['crews'][0]['tour'] if k in key_of]
+    missing = [nid for nid in key_of.values() if nid not in tour]
+    METRICS.count('plan_cache.warm_start')
+    print(f"   ♨️ [계획 캐시] 유사한 이전 계획(겹침 {best_overlap*100:.0f}%)으로 warm-start 합니다.")
+    return cheapest_insertion(tour, missing, matrix)
+
 # ==========================================
 # 메인
 # ==========================================
-def main():
+def main(metrics_file=None):
     print_separator("교량 점검 최적 경로 스케줄러 (Ultimate Battle Edition)")
     
     if not os.path.exists(CSV_FILE_NAME): 
         print(f"   ❌ 오류: '{CSV_FILE_NAME}' 파일이 없습니다.")
         return
     
-    try: df = pd.read_csv(CSV_FILE_NAME, encoding='utf-8')
-    except: 
-        try: df = pd.read_csv(CSV_FILE_NAME, encoding='cp949')
-        except: print("   ❌ CSV 파일을 읽을 수 없습니다."); return
+    wait_bridge_data = preload_planner_data()
 
     # 1. 입력 단계
     print("   📍 기본 정보를 입력해주세요.")
@@ -530,6 +2477,8 @@ def main():
             except: print("      ❌ 숫자를 입력해주세요.")
 
     # 3. 교량 선택
+    df = wait_bridge_data()
+    if df is None: print("   ❌ CSV 파일을 읽을 수 없습니다."); return
     t_input = input("\n   Bridge 점검할 교량 이름 (쉼표 구분): ").strip()
     if not t_input: return
     target_names = [x.strip() for x in t_input.split(',')]
@@ -567,153 +2516,73 @@ def main():
             if t=='1': it=int(d['inspection_basic']); ity="일반점검"
             else: it=int(d['inspection_hard']); ity="보수점검"
             
-        nodes.append({'id': idx_cnt, 'name': d['name'], 'coord': f"{d['longitude']},{d['latitude']}", 'insp_time': it, 'insp_type': ity})
+        nodes.append(make_bridge_node(idx_cnt, d, it, ity))
         idx_cnt += 1
 
     if len(nodes) < 2: return
 
+    num_crews = 1
+    while True:
+        c_s = input("\n   👥 점검팀 수 (엔터 시 1팀): ").strip()
+        if not c_s: break
+        try: num_crews = max(1, int(c_s)); break
+        except ValueError: print("      ❌ 숫자를 입력해주세요.")
+
     # 4. [BATTLE] 알고리즘 배틀 시작
-    print_separator("알고리즘 배틀 시작 (Route A vs Route B)")
+    print_separator("알고리즘 배틀 시작 (Route A vs Route B vs Route C)")
     matrix = build_od_matrix(nodes, departure_time_str)
-    
-    # 4-1. Route A 계산 (전수 조사 방식)
-    path_a, cost_a, time_a = solve_route_a(nodes, matrix, start_node_id=0)
-    
-    # 4-2. Route B 계산 (SA 방식)
-    path_b, cost_b, time_b = solve_route_b(nodes, matrix, start_node_id=0)
-    
-    # 4-3. 배틀 결과 판정
-    print_separator("배틀 결과 (Battle Result)")
-    print(f"   🔵 [Route A - Deep Search] 예상시간: {int(cost_a/60)}분 (계산소요: {time_a*1000:.1f}ms)")
-    print(f"   🔴 [Route B - Memetic SA] 예상시간: {int(cost_b/60)}분 (계산소요: {time_b*1000:.1f}ms)")
-    
-    winner_path = []
-    winner_name = ""
-    if cost_a < cost_b:
-        print(f"\n   🏆 [승자 확정] Route A 가 {int((cost_b - cost_a)/60)}분 더 빠릅니다!")
-        winner_path = path_a
-        winner_name = "Route A (Deep Search)"
-    elif cost_b < cost_a:
-        print(f"\n   🏆 [승자 확정] Route B 가 {int((cost_a - cost_b)/60)}분 더 빠릅니다!")
-        winner_path = path_b
-        winner_name = "Route B (Memetic SA)"
-    else:
-        print(f"\n   🤝 [무승부] 두 알고리즘의 최적 경로 시간이 동일합니다.")
-        winner_path = path_a
-        winner_name = "Route A (Tie-Breaker)"
+    crews = solve_plan_crews(nodes, matrix, num_crews, start_dt=start_dt, dest_coord=dest_coord)
 
     node_map = {n['id']: n for n in nodes}
-    sorted_nodes = [node_map[nid] for nid in winner_path]
-    
-    print(f"\n   🔒 [최종 확정된 방문 순서]")
-    for i, node in enumerate(sorted_nodes):
-        print(f"      {i}. {node['name']}")
-
-    # [Step 4] 시뮬레이션
-    print(f"\n   🚀 [시뮬레이션] 실시간 교통정보 반영하여 일정 산출 중...")
-    
-    current_day = 1
-    day_basis = start_dt
-    curr_dt = day_basis
-    prev_node = sorted_nodes[0]
-    
-    map_log = []
-    visited_info = [] 
-    
-    visited_info.append({
-        'name': start_name, 'coord': start_coord, 'order': 0,
-        'day': 1, 'date': day_basis.strftime('%Y-%m-%d'),
-        'move_min': 0, 'insp_min': 0, 'insp_type': '출발',
-        'arrival_time': curr_dt.strftime('%H:%M'), 'finish_time': curr_dt.strftime('%H:%M')
-    })
-    
-    print(f"\n   🚩 [Day 1] {curr_dt.strftime('%H:%M')} 출발")
-
-    for i in range(1, len(sorted_nodes)):
-        target = sorted_nodes[i]
-        limit_dt = day_basis + datetime.timedelta(hours=WORK_LIMIT_HOURS)
+    html_files = []
+    for c, crew in enumerate(crews):
+        crew_tag = f"[팀 {c + 1}] " if len(crews) > 1 else ""
+        sorted_nodes = [node_map[nid] for nid in crew['path']]
         
-        move_sec, path_data = get_kakao_route_data(prev_node['coord'], target['coord'], curr_dt.strftime("%Y%m%d%H%M"))
-        move_min = move_sec // 60
-        
-        arr_dt = curr_dt + datetime.timedelta(minutes=move_min)
-        fin_dt = arr_dt + datetime.timedelta(minutes=target['insp_time'])
-        
-        is_next_day = False
-        if fin_dt > limit_dt:
-            print(f"      ⚠️  경고: '{target['name']}' 작업 시 근무 시간 초과 예상 ({fin_dt.strftime('%H:%M')})")
-            while True:
-                c = input("          >> 연장근무(y) / 숙박 후 다음날(n)? ").lower()
-                if c=='y': is_next_day=False; break
-                elif c=='n': is_next_day=True; break
-        
-        if is_next_day:
-            current_day += 1
-            day_basis = datetime.datetime.combine(day_basis.date() + datetime.timedelta(days=1), get_next_day_start_time(current_day))
-            curr_dt = day_basis
-            print(f"\n   ☀️ [Day {current_day}] {curr_dt.strftime('%Y-%m-%d %H:%M')} 출발")
-            
-            move_sec, path_data = get_kakao_route_data(prev_node['coord'], target['coord'], curr_dt.strftime("%Y%m%d%H%M"))
-            move_min = move_sec // 60
-            arr_dt = curr_dt + datetime.timedelta(minutes=move_min)
-            fin_dt = arr_dt + datetime.timedelta(minutes=target['insp_time'])
-        
-        map_log.append({'day': current_day, 'start_id': prev_node['id'], 'end_id': target['id'], 'path_data': path_data})
-        visited_info.append({
-            'name': target['name'], 'coord': target['coord'], 'order': i,
-            'day': current_day, 'date': day_basis.strftime('%Y-%m-%d'),
-            'move_min': move_min, 'insp_min': target['insp_time'], 'insp_type': target['insp_type'],
-            'arrival_time': arr_dt.strftime('%H:%M'), 'finish_time': fin_dt.strftime('%H:%M')
-        })
-        
-        print(f"      🚗 {move_min}분 이동 ➔ {target['name']} ({arr_dt.strftime('%H:%M')} 도착)")
-        curr_dt = fin_dt
-        prev_node = target
+        print(f"\n   🔒 {crew_tag}[최종 확정된 방문 순서]")
+        for i, node in enumerate(sorted_nodes):
+            print(f"      {i}. {node['name']}")
 
-    # 복귀
-    query_time = curr_dt.strftime("%Y%m%d%H%M")
-    ret_sec, ret_path = get_kakao_route_data(prev_node['coord'], dest_coord, query_time)
-    ret_min = ret_sec // 60
-    final_dt = curr_dt + datetime.timedelta(minutes=ret_min)
-    limit_dt = day_basis + datetime.timedelta(hours=WORK_LIMIT_HOURS)
-    
-    is_return_delay = False
-    if final_dt > limit_dt:
-        over_minutes = int((final_dt - limit_dt).total_seconds() // 60)
-        print(f"      ⚠️  경고: 복귀 시 근무 시간 초과 예상 ({final_dt.strftime('%H:%M')}, +{over_minutes}분)")
-        while True:
-            c = input("          >> 퇴근 강행(y) / 숙박 후 다음날(n)? ").lower()
-            if c=='y': is_return_delay = False; break
-            elif c=='n': is_return_delay = True; break
+        # [Step 4] 시뮬레이션
+        print(f"\n   🚀 {crew_tag}[시뮬레이션] 실시간 교통정보 반영하여 일정 산출 중...")
+        map_log, visited_info = simulate_schedule(sorted_nodes, start_dt, dest_name, dest_coord, InteractivePolicy(), matrix)
+        print_schedule_summary(visited_info)
 
-    if is_return_delay:
-        current_day += 1
-        day_basis = datetime.datetime.combine(day_basis.date() + datetime.timedelta(days=1), get_next_day_start_time(current_day))
-        curr_dt = day_basis
-        ret_sec, ret_path = get_kakao_route_data(prev_node['coord'], dest_coord, curr_dt.strftime("%Y%m%d%H%M"))
-        ret_min = ret_sec // 60
-        final_dt = curr_dt + datetime.timedelta(minutes=ret_min)
-        print(f"\n   ☀️ [Day {current_day}] 복귀 출발")
-
-    map_log.append({'day': current_day, 'start_id': prev_node['id'], 'end_id': 0, 'path_data': ret_path})
-    visited_info.append({
-        'name': f"{dest_name} (도착)", 'coord': dest_coord, 'order': len(sorted_nodes),
-        'day': current_day, 'date': day_basis.strftime('%Y-%m-%d'),
-        'move_min': ret_min, 'insp_min': 0, 'insp_type': '복귀',
-        'arrival_time': final_dt.strftime('%H:%M'), 'finish_time': final_dt.strftime('%H:%M')
-    })
-    
-    print(f"      🚗 {ret_min}분 이동 ➔ {dest_name} ({final_dt.strftime('%H:%M')} 도착)")
-    
-    print_separator("최종 스케줄 요약")
-    print(f"{'순서':<5} | {'Day':<5} | {'장소명':<15} | {'도착':<8} | {'이동(분)':<8} | {'작업(분)':<8}")
-    print("-" * 70)
-    for info in visited_info:
-        print(f"{info['order']:<5} | {info['day']:<5} | {info['name']:<15} | {info['arrival_time']:<8} | {info['move_min']:<8} | {info['insp_min']:<8}")
-    print("-" * 70)
+        html_file = HTML_FILE if len(crews) == 1 else HTML_FILE.replace('.html', f'_crew{c + 1}.html')
+        generate_kakao_map_html(map_log, visited_info, f"{crew_tag}{crew['winner']}", html_file=html_file)
+        html_files.append(html_file)
 
-    generate_kakao_map_html(map_log, visited_info, winner_name)
-    serve_and_open()
+    if METRICS_ENABLED: print(f"   📊 계측 결과 저장: {os.path.abspath(METRICS.dump(metrics_file))}")
+    if len(html_files) == 1: return serve_and_open(html_files[0])
+    for c, html_file in enumerate(html_files[1:], start=2):
+        print(f"   🔗 추가 리포트: {get_report_server().register(f'crew{c}', html_file)}")
+    serve_and_open(html_files[0], plan_id='crew1')
 
 if __name__ == "__main__": 
-    main()
+    parser = argparse.ArgumentParser(description="교량 점검 최적 경로 스케줄러")
+    parser.add_argument('--batch', metavar='JOB_FILE', help="작업 파일(JSON/YAML)로 여러 계획을 무인 병렬 처리")
+    parser.add_argument('--out', default=BATCH_OUTPUT_DIR, help="배치 결과 저장 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="작업자 프로세스 수 (배치/서비스)")
+    parser.add_argument('--serve', action='store_true', help="상주 플래닝 서비스(REST API) 실행")
+    parser.add_argument('--serve-reports', metavar='DIR', help="폴더의 <plan_id>.html 리포트를 모두 등록해 로컬 서버로 제공")
+    parser.add_argument('--port', type=int, default=None, help=f"플래닝 서비스 포트 (기본 {SERVICE_PORT}) / 리포트 서버 포트 (기본 {PORT})")
+    parser.add_argument('--api-base', metavar='URL', help="Kakao API 대신 사용할 서버 주소 (예: 모의 서버 http://127.0.0.1:8300)")
+    parser.add_argument('--replan', metavar='STATE_FILE', help="저장된 계획 상태(<plan_id>.state.json)를 증분 재계획")
+    parser.add_argument('--add', default="", help="재계획 시 추가할 교량 (쉼표 구분, '교량명:보수' 가능)")
+    parser.add_argument('--remove', default="", help="재계획 시 뺄 교량 이름 (쉼표 구분)")
+    parser.add_argument('--progress', choices=list(PROGRESS_SINKS), default='console', help="진행 상황 출력 방식")
+    parser.add_argument('--progress-file', metavar='FILE', help="log/json 진행 상황을 저장할 파일 (기본: 화면)")
+    parser.add_argument('--metrics', metavar='FILE', default=None, help="계측 결과 JSON 저장 경로 (기본: metrics/run_<시각>.json)")
+    parser.add_argument('--profile', metavar='FILE', default=None, help="cProfile 결과(.prof) 저장 경로")
+    args = parser.parse_args()
+    if args.api_base: KAKAO_LOCAL_API_URL = KAKAO_NAVI_API_URL = args.api_base.rstrip('/')
+    if args.progress != 'console':
+        set_progress_sink(PROGRESS_SINKS[args.progress](args.progress_file) if args.progress in ('log', 'json') else NullProgress())
+    with profile_to(args.profile):
+        if args.batch: run_batch(args.batch, args.out, args.workers or BATCH_MAX_WORKERS)
+        elif args.serve: run_service(args.port or SERVICE_PORT, SERVICE_OUTPUT_DIR, args.workers or SERVICE_WORKERS)
+        elif args.serve_reports: serve_report_dir(args.serve_reports, args.port or PORT)
+        elif args.replan:
+            split = lambda t: [x.strip() for x in t.split(',') if x.strip()]
+            run_replan(args.replan, split(args.add), split(args.remove), args.out if args.out != BATCH_OUTPUT_DIR else None)
+        else: main(args.metrics)
@@ -0,0 +1,185 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# ======================================================
+# 1. 사용자 설정
+# ======================================================
+ALGORITHM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.OPF_Algorithm_Finale.py")
+SYNTHETIC_SIZES = [10, 25, 50, 100, 200]       # 합성 인스턴스 노드 수 (출발지 포함)
+RECORDED_MAX_NODES = 200                        # route_cache.json 재생 인스턴스 최대 노드 수
+TIME_BUDGET_SEC = {10: 2, 25: 5, 50: 10, 100: 20, 200: 30}   # 노드 수별 solver 시간 예산 (초)
+SEED = 42
+RESULT_DIR = "bench_results"
+BEST_KNOWN_FILE = "bench_best_known.json"      # 인스턴스별 최적 기록 (gap 계산 기준)
+REGRESSION_COST_TOL = 0.01                      # 기준 결과 대비 비용 1% 초과 시 회귀
+REGRESSION_TIME_TOL = 0.50                      # 기준 결과 대비 시간 50% 초과 시 회귀
+
+# ======================================================
+# 2. 알고리즘 모듈 불러오기 (파일명이 숫자로 시작하므로 경로로 로드)
+# ======================================================
+def load_algorithm_module(path=ALGORITHM_FILE):
+    import opf_planner
+    return opf_planner.load_module(path)
+
+# ======================================================
+# 3. 벤치마크 인스턴스
+# ======================================================
+def make_synthetic_instance(n, seed=SEED):
+    # 전국 범위 임의 좌표 + 방향별 교통 편차(비대칭) 소요시간 행렬
+    rng = random.Random(f"{seed}-{n}")
+    pts = [(rng.uniform(126.5, 129.3), rng.uniform(34.8, 37.9)) for _ in range(n)]
+    nodes = [{'id': i, 'name': f"N{i}", 'coord': f"{x:.6f},{y:.6f}",
+              'insp_time': 0 if i == 0 else rng.choice([60, 80, 120]), 'insp_type': '-'} for i, (x, y) in enumerate(pts)]
+    matrix = {}
+    for i, (x1, y1) in enumerate(pts):
+        for j, (x2, y2) in enumerate(pts):
+            if i == j: matrix[(i, j)] = {'time': 0}; continue
+            km = math.hypot((x2 - x1) * 88.8, (y2 - y1) * 111.0) * 1.3
+            matrix[(i, j)] = {'time': int(km / 70 * 3600 * rng.uniform(0.9, 1.25)) + 300}
+    return {'name': f"synthetic_{n}", 'source': 'synthetic', 'nodes': nodes, 'matrix': matrix}
+
+def load_recorded_instance(cache_file, max_nodes=RECORDED_MAX_NODES):
+    # route_cache.json에서 모든 쌍(양방향)이 기록된 좌표 집합을 골라 실제 행렬로 재생
+    if not os.path.exists(cache_file): return None
+    with open(cache_file, 'r', encoding='utf-8') as f: cache = json.load(f)
+    times = {}
+    for key, val in cache.items():
+        a, _, b = key.partition('|')
+        times[(a, b)] = val.get('time', val.get('duration', 0))
+
+    partners = {}
+    for a, b in times: partners.setdefault(a, set()).add(b)
+    chosen = []
+    for c in sorted(partners, key=lambda c: len(partners[c]), reverse=True):
+        if all((c, o) in times and (o, c) in times for o in chosen): chosen.append(c)
+        if len(chosen) >= max_nodes: break
+    if len(chosen) < 5: return None
+
+    nodes = [{'id': i, 'name': f"R{i}", 'coord': c, 'insp_time': 0 if i == 0 else 60, 'insp_type': '-'} for i, c in enumerate(chosen)]
+    matrix = {(i, j): {'time': 0 if i == j else times[(a, b)]} for i, a in enumerate(chosen) for j, b in enumerate(chosen)}
+    return {'name': f"recorded_{len(chosen)}", 'source': 'recorded', 'nodes': nodes, 'matrix': matrix}
+
+# ======================================================
+# 4. 실행 / 측정
+# ======================================================
+def run_solver(opf, solver, instance, time_limit, seed, measure_memory):
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()), opf.progress_to(opf.NullProgress()):
+        if measure_memory: tracemalloc.start()
+        start = time.perf_counter()
+        path, cost, _ = solver(instance['nodes'], instance['matrix'], start_node_id=0, time_limit=time_limit)
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        if measure_memory: tracemalloc.stop()
+    return path, cost, wall, peak
+
+def run_benchmark(opf, instances, solver_names, budget_override=None, seed=SEED, measure_memory=True, best_known=None):
+    best_known = dict(best_known or {})
+    rows = []
+    for inst in instances:
+        n = len(inst['nodes'])
+        budget = budget_override or TIME_BUDGET_SEC.get(n) or TIME_BUDGET_SEC[min(TIME_BUDGET_SEC, key=lambda k: abs(k - n))]
+        print(f"\n   📦 {inst['name']} (노드 {n}개, 예산 {budget}초)")
+        for name in solver_names:
+            path, cost, wall, _ = run_solver(opf, opf.SOLVERS[name], inst, budget, seed, False)
+            # 메모리 측정은 tracemalloc 오버헤드가 시간에 섞이지 않도록 별도 실행
+            peak = run_solver(opf, opf.SOLVERS[name], inst, budget, seed, True)[3] if measure_memory else None
+            valid = sorted(path) == sorted(nd['id'] for nd in inst['nodes'])
+            rows.append({'instance': inst['name'], 'source': inst['source'], 'n': n, 'solver': name,
+                         'budget_sec': budget, 'cost_sec': cost, 'wall_ms': wall * 1000,
+                         'peak_kb': peak / 1024 if peak is not None else None, 'valid': valid})
+            print(f"      ▶ {name:<10} 비용 {cost/60:9.1f}분 | {wall*1000:9.1f}ms" + (f" | {peak/1024:9.1f}KB" if peak is not None else ""))
+            if valid and cost < best_known.get(inst['name'], float('inf')): best_known[inst['name']] = cost
+
+    for r in rows:
+        best = best_known.get(r['instance'])
+        r['gap_pct'] = (r['cost_sec'] - best) / best * 100 if best else None
+    return rows, best_known
+
+def find_regressions(rows, baseline_rows):
+    base = {(r['instance'], r['solver']): r for r in baseline_rows}
+    regressions = []
+    for r in rows:
+        b = base.get((r['instance'], r['solver']))
+        if not b: continue
+        if r['cost_sec'] > b['cost_sec'] * (1 + REGRESSION_COST_TOL):
+            regressions.append(f"{r['instance']}/{r['solver']} 비용 {b['cost_sec']} → {r['cost_sec']}")
+        if r['wall_ms'] > b['wall_ms'] * (1 + REGRESSION_TIME_TOL) and r['wall_ms'] < r['budget_sec'] * 1000:
+            regressions.append(f"{r['instance']}/{r['solver']} 시간 {b['wall_ms']:.1f}ms → {r['wall_ms']:.1f}ms")
+    return regressions
+
+def print_table(rows):
+    print(f"\n{'='*96}")
+    print(f" {'인스턴스':<16} | {'n':>4} | {'solver':<10} | {'비용(분)':>9} | {'gap(%)':>7} | {'시간(ms)':>10} | {'메모리(KB)':>10} | 유효")
+    print(f"{'-'*96}")
+    for r in rows:
+        gap = f"{r['gap_pct']:.2f}" if r['gap_pct'] is not None else "-"
+        peak = f"{r['peak_kb']:.1f}" if r['peak_kb'] is not None else "-"
+        print(f" {r['instance']:<16} | {r['n']:>4} | {r['solver']:<10} | {r['cost_sec']/60:>9.1f} | {gap:>7} | {r['wall_ms']:>10.1f} | {peak:>10} | {'O' if r['valid'] else 'X'}")
+    print(f"{'='*96}")
+
+# ======================================================
+# 5. 메인
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="경로 최적화 solver 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SYNTHETIC_SIZES, help="합성 인스턴스 노드 수")
+    parser.add_argument('--solvers', nargs='+', default=None, help="실행할 solver (기본: 전체)")
+    parser.add_argument('--budget', type=float, default=None, help="모든 인스턴스에 동일하게 적용할 시간 예산(초)")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--cache', default=None, help="재생할 route_cache.json 경로 (기본: 알고리즘 설정값)")
+    parser.add_argument('--no-recorded', action='store_true', help="route_cache.json 재생 인스턴스 제외")
+    parser.add_argument('--no-memory', action='store_true', help="최대 메모리 측정 생략")
+    parser.add_argument('--baseline', default=None, help="회귀 비교용 이전 결과 JSON")
+    parser.add_argument('--out', default=RESULT_DIR)
+    args = parser.parse_args()
+
+    opf = load_algorithm_module()
+    solver_names = args.solvers or list(opf.SOLVERS)
+    unknown = [s for s in solver_names if s not in opf.SOLVERS]
+    if unknown:
+        print(f"❌ 알 수 없는 solver: {unknown} (사용 가능: {list(opf.SOLVERS)})")
+        return 2
+
+    instances = [make_synthetic_instance(n, args.seed) for n in args.sizes]
+    if not args.no_recorded:
+        recorded = load_recorded_instance(args.cache or opf.CACHE_FILE_NAME)
+        if recorded: instances.append(recorded)
+        else: print("   ⚠️ 재생 가능한 route_cache.json 행렬이 없어 합성 인스턴스만 실행합니다.")
+
+    best_known = {}
+    if os.path.exists(BEST_KNOWN_FILE):
+        with open(BEST_KNOWN_FILE, 'r', encoding='utf-8') as f: best_known = json.load(f)
+
+    print("🚀 벤치마크를 시작합니다...")
+    rows, best_known = run_benchmark(opf, instances, solver_names, args.budget, args.seed, not args.no_memory, best_known)
+    print_table(rows)
+
+    with open(BEST_KNOWN_FILE, 'w', encoding='utf-8') as f: json.dump(best_known, f, ensure_ascii=False, indent=4)
+    os.makedirs(args.out, exist_ok=True)
+    out_file = os.path.join(args.out, f"bench_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out_file, 'w', encoding='utf-8') as f:
+        json.dump({'seed': args.seed, 'python': sys.version.split()[0], 'results': rows}, f, ensure_ascii=False, indent=4)
+    print(f"📁 결과 저장: {out_file}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f: baseline_rows = json.load(f)['results']
+        regressions = find_regressions(rows, baseline_rows)
+        if regressions:
+            print("\n❌ 성능 회귀 감지:")
+            for msg in regressions: print(f"   - {msg}")
+            return 1
+        print("\n✅ 기준 결과 대비 회귀 없음")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import argparse
+import contextlib
+import datetime
+import hashlib
+import http.server
+import io
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+
+# ======================================================
+# 1. 사용자 설정
+# ======================================================
+# Kakao 주소검색(dapi.kakao.com) / 길찾기(apis-navi.kakaomobility.com) 대신 쓰는 로컬 모의 서버
+# 같은 입력에는 항상 같은 좌표/소요시간을 돌려주므로 오프라인 테스트와 I/O 성능 측정에 사용
+MOCK_HOST = "127.0.0.1"
+MOCK_PORT = 8300
+MOCK_LATENCY_MS = 30          # 평균 응답 지연 (ms)
+MOCK_JITTER_MS = 20           # 지연 편차 (± ms, 균등분포)
+MOCK_ERROR_RATE = 0.0         # 500 오류 비율 (0~1)
+MOCK_RATE_LIMIT = 0           # 초당 허용 요청 수 (0: 무제한, 초과 시 429)
+MOCK_RETRY_AFTER = None       # 429 응답의 Retry-After 헤더 (초, None이면 헤더 없음)
+MOCK_GEOCODE_MISS_RATE = 0.0  # 주소검색 결과가 없는 주소 비율 (주소별로 고정, 키워드 검색은 항상 성공)
+MOCK_SEED = 42
+MOCK_SPEED_KMH = 60           # 합성 소요시간 기준 평균 속도
+MOCK_ROUTE_VERTICES = 20      # 합성 경로 좌표 수
+
+ALGORITHM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "3.OPF_Algorithm_Finale.py")
+RESULT_DIR = "bench_results"
+
+# ======================================================
+# 2. 합성 응답 (입력 해시 기반 → 항상 같은 결과)
+# ======================================================
+def _unit(*parts):
+    # 입력 문자열 → [0, 1) 고정 난수
+    digest = hashlib.sha256("|".join(map(str, parts)).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+def mock_geocode(query, miss_rate=MOCK_GEOCODE_MISS_RATE, keyword=False):
+    if not query or (not keyword and _unit('miss', query) < miss_rate): return {'documents': [], 'meta': {'total_count': 0}}
+    lng = 126.5 + _unit('lng', query) * 2.8
+    lat = 34.8 + _unit('lat', query) * 3.1
+    doc = {'address_name': query, 'x': f"{lng:.7f}", 'y': f"{lat:.7f}"}
+    return {'documents': [doc], 'meta': {'total_count': 1}}
+
+def mock_directions(origin, destination, departure_time=None, speed_kmh=MOCK_SPEED_KMH, vertices=MOCK_ROUTE_VERTICES):
+    (x1, y1), (x2, y2) = (tuple(map(float, c.split(',')[:2])) for c in (origin, destination))
+    km = math.hypot((x2 - x1) * 88.8, (y2 - y1) * 111.0) * 1.3
+    factor = 0.9 + _unit('dir', origin, destination) * 0.3    # 방향별 교통 편차 (비대칭)
+    if departure_time and departure_time[8:10] in ('07', '08', '17', '18'): factor *= 1.3   # 출퇴근 시간대
+    duration = int(km / speed_kmh * 3600 * factor) + 60
+    # 직선을 살짝 휘게 만든 합성 경로
+    bend = (_unit('bend', origin, destination) - 0.5) * 0.2
+    vertexes = []
+    for k in range(vertices):
+        t = k / (vertices - 1)
+        off = math.sin(math.pi * t) * bend
+        vertexes += [round(x1 + (x2 - x1) * t - (y2 - y1) * off, 7), round(y1 + (y2 - y1) * t + (x2 - x1) * off, 7)]
+    distance = int(km * 1000)
+    road = {'name': "", 'distance': distance, 'duration': duration, 'vertexes': vertexes}
+    return {'trans_id': hashlib.md5(f"{origin}|{destination}".encode()).hexdigest(), 'routes': [{
+        'result_code': 0, 'result_msg': "길찾기 성공",
+        'summary': {'origin': {'x': x1, 'y': y1}, 'destination': {'x': x2, 'y': y2}, 'distance': distance, 'duration': duration},
+        'sections': [{'distance': distance, 'duration': duration, 'roads': [road]}],
+    }]}
+
+# ======================================================
+# 3. 모의 서버 (지연 / 오류율 / 429 요청 한도)
+# ======================================================
+class MockKakaoServer:
+    def __init__(self, host=MOCK_HOST, port=MOCK_PORT, latency_ms=MOCK_LATENCY_MS, jitter_ms=MOCK_JITTER_MS,
+                 error_rate=MOCK_ERROR_RATE, rate_limit=MOCK_RATE_LIMIT, retry_after=MOCK_RETRY_AFTER,
+                 miss_rate=MOCK_GEOCODE_MISS_RATE, seed=MOCK_SEED):
+        self.latency_ms, self.jitter_ms, self.error_rate = latency_ms, jitter_ms, error_rate
+        self.rate_limit, self.retry_after, self.miss_rate = rate_limit, retry_after, miss_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens, self.last_refill = float(rate_limit), time.monotonic()
+        self.stats = {}
+        self.httpd = http.server.ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.httpd.server_address[0]}:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_stats(self):
+        with self.lock: self.stats = {}
+
+    def _record(self, endpoint, status):
+        with self.lock:
+            s = self.stats.setdefault(endpoint, {})
+            s[str(status)] = s.get(str(status), 0) + 1
+
+    def _admit(self):
+        # 토큰 버킷: 초당 rate_limit개 (최대 rate_limit개까지 몰아서 허용)
+        if not self.rate_limit: return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.last_refill) * self.rate_limit)
+            self.last_refill = now
+            if self.tokens < 1: return False
+            self.tokens -= 1
+            return True
+
+    def _draw(self):
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            failed = self.rng.random() < self.error_rate
+        return delay, failed
+
+    def respond(self, path, query):
+        # (상태코드, 본문, 추가 헤더)
+        params = {k: v[0] for k, v in urllib.parse.parse_qs(query).items()}
+        if path == '/_stats':
+            with self.lock: return 200, json.loads(json.dumps(self.stats)), {}
+        if path not in ('/v2/local/search/address.json', '/v2/local/search/keyword.json', '/v1/directions'):
+            return 404, {'code': -404, 'msg': "not found"}, {}
+        if not self._admit():
+            self._record(path, 429)
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else {}
+            return 429, {'code': -10, 'msg': "API limit has been exceeded."}, headers
+
+        delay, failed = self._draw()
+        time.sleep(delay)
+        if failed:
+            self._record(path, 500)
+            return 500, {'code': -1, 'msg': "internal error (mock)"}, {}
+        try:
+            if path == '/v1/directions':
+                body = mock_directions(params['origin'], params['destination'], params.get('departure_time'))
+            else:
+                body = mock_geocode(params.get('query', ''), self.miss_rate, keyword=path.endswith('keyword.json'))
+        except (KeyError, ValueError):
+            self._record(path, 400)
+            return 400, {'code': -2, 'msg': "invalid parameter"}, {}
+        self._record(path, 200)
+        return 200, body, {}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path, _, query = self.path.partition('?')
+                code, body, headers = server.respond(path, query)
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for k, v in headers.items(): self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args): pass
+
+        return Handler
+
+# ======================================================
+# 4. 부하 측정 (좌표 변환 / O-D 행렬 생성 처리량)
+# ======================================================
+def load_algorithm_module(path=ALGORITHM_FILE):
+    import opf_planner
+    return opf_planner.load_module(path)
+
+def measure_geocoding(opf, count, workers):
+    import concurrent.futures
+    addrs = [f"모의시 테스트구 교량로 {i}" for i in range(count)]
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        coords = list(executor.map(opf.get_coordinate, addrs))
+    wall = time.perf_counter() - start
+    return {'requests': count, 'workers': workers, 'wall_sec': wall, 'per_sec': count / wall,
+            'failed': sum(1 for c in coords if not c)}
+
+def measure_matrix(opf, n_nodes, seed=MOCK_SEED):
+    rng = random.Random(seed)
+    nodes = [{'id': i, 'name': f"N{i}", 'coord': f"{rng.uniform(126.8, 127.8):.6f},{rng.uniform(36.8, 37.8):.6f}",
+              'insp_time': 60, 'insp_type': '-'} for i in range(n_nodes)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), opf.progress_to(opf.NullProgress()):
+        matrix = opf.build_od_matrix(nodes, datetime.datetime.now().strftime("%Y%m%d0900"))
+    wall = time.perf_counter() - start
+    pairs = n_nodes * (n_nodes - 1)
+    failed = sum(1 for (a, b), v in matrix.items() if a != b and not v['path'])
+    return {'nodes': n_nodes, 'pairs': pairs, 'wall_sec': wall, 'per_sec': pairs / wall, 'failed': failed}
+
+def run_load_test(server, node_sizes, geocode_count, geocode_workers):
+    opf = load_algorithm_module()
+    opf.KAKAO_LOCAL_API_URL = opf.KAKAO_NAVI_API_URL = server.url
+    opf.USE_API_CACHE = False   # 매 요청이 서버까지 가도록 (실제 route_cache.json도 건드리지 않음)
+    results = {'geocoding': [], 'matrix': []}
+
+    for workers in geocode_workers:
+        server.reset_stats(); opf.METRICS.reset()
+        r = measure_geocoding(opf, geocode_count, workers)
+        r.update(server=server.stats, counters=opf.METRICS.summary()['counters'])
+        results['geocoding'].append(r)
+        print(f"   📍 좌표 변환  | 동시 {workers:>2} | {r['requests']:>5}건 | {r['wall_sec']:7.2f}초 | {r['per_sec']:8.1f}건/초 | 실패 {r['failed']}")
+
+    for n in node_sizes:
+        server.reset_stats(); opf.METRICS.reset()
+        r = measure_matrix(opf, n)
+        summary = opf.METRICS.summary()
+        r.update(server=server.stats, counters=summary['counters'], latency=summary['api_latency'].get('directions'))
+        results['matrix'].append(r)
+        print(f"   🧮 행렬 생성  | 노드 {n:>4} | {r['pairs']:>5}쌍 | {r['wall_sec']:7.2f}초 | {r['per_sec']:8.1f}쌍/초 | 실패 {r['failed']}"
+              f" | 429 재시도 {r['counters'].get('api.directions.throttled', 0)}")
+    return results
+
+# ======================================================
+# 5. 메인
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Kakao API 모의 서버 / 부하 측정")
+    parser.add_argument('mode', choices=['serve', 'loadtest'], help="serve: 모의 서버만 실행, loadtest: 서버 실행 후 처리량 측정")
+    parser.add_argument('--port', type=int, default=MOCK_PORT)
+    parser.add_argument('--latency', type=float, default=MOCK_LATENCY_MS, help="평균 응답 지연 (ms)")
+    parser.add_argument('--jitter', type=float, default=MOCK_JITTER_MS, help="지연 편차 (ms)")
+    parser.add_argument('--error-rate', type=float, default=MOCK_ERROR_RATE, help="500 오류 비율 (0~1)")
+    parser.add_argument('--rate-limit', type=float, default=MOCK_RATE_LIMIT, help="초당 허용 요청 수 (0: 무제한)")
+    parser.add_argument('--retry-after', type=float, default=MOCK_RETRY_AFTER, help="429 응답의 Retry-After (초)")
+    parser.add_argument('--miss-rate', type=float, default=MOCK_GEOCODE_MISS_RATE, help="주소검색 결과 없음 비율 (0~1)")
+    parser.add_argument('--seed', type=int, default=MOCK_SEED)
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10, 30], help="[loadtest] 행렬 생성 노드 수")
+    parser.add_argument('--geocodes', type=int, default=200, help="[loadtest] 좌표 변환 요청 수")
+    parser.add_argument('--geocode-workers', type=int, nargs='+', default=[1, 8], help="[loadtest] 좌표 변환 동시 요청 수")
+    parser.add_argument('--out', default=RESULT_DIR)
+    args = parser.parse_args()
+
+    server = MockKakaoServer(port=args.port if args.mode == 'serve' else 0, latency_ms=args.latency, jitter_ms=args.jitter,
+                             error_rate=args.error_rate, rate_limit=args.rate_limit, retry_after=args.retry_after,
+                             miss_rate=args.miss_rate, seed=args.seed).start()
+    if args.mode == 'serve':
+        print(f"🧪 Kakao 모의 서버 실행 중: {server.url} (Ctrl+C 종료)")
+        print(f"   사용 예) python 3.OPF_Algorithm_Finale.py --api-base {server.url}")
+        try: server.thread.join()
+        except KeyboardInterrupt: server.stop()
+        return 0
+
+    print(f"🚀 부하 측정을 시작합니다... (모의 서버 {server.url}, 지연 {args.latency}±{args.jitter}ms, "
+          f"오류율 {args.error_rate}, 요청 한도 {args.rate_limit or '없음'}/초)")
+    try: results = run_load_test(server, args.nodes, args.geocodes, args.geocode_workers)
+    finally: server.stop()
+
+    os.makedirs(args.out, exist_ok=True)
+    out_file = os.path.join(args.out, f"loadtest_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out_file, 'w', encoding='utf-8') as f:
+        json.dump({'config': {k: v for k, v in vars(args).items() if k not in ('mode', 'out')}, 'results': results},
+                  f, ensure_ascii=False, indent=4)
+    print(f"📁 결과 저장: {out_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
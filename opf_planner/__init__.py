@@ -0,0 +1,31 @@
+# 3.OPF_Algorithm_Finale.py를 다른 코드에서 `import opf_planner`로 사용하기 위한 패키지
+# 파일명이 숫자로 시작해 일반 import가 불가능하므로 하위 모듈 opf_planner.algorithm이 스크립트를 실행해 담으며,
+# 속성(solve_route_a, build_od_matrix 등)에 처음 접근할 때 로드해 import 자체는 즉시 끝남
+#   예) import opf_planner; opf_planner.solve_route_a(nodes, matrix)
+#   설정 변경) planner = opf_planner.load_module(); planner.CSV_FILE_NAME = "Final_Bridge_Data.csv"
+# 하위 모듈 registry(교량 목록 바이너리 스냅샷)는 알고리즘 모듈을 로드하지 않고 단독으로 사용 가능
+#   예) from opf_planner import registry; df = registry.load("Final_Bridge_Data.csv").frame()
+import importlib
+import os
+import sys
+
+ALGORITHM_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3.OPF_Algorithm_Finale.py")
+MODULE_NAME = "opf_planner.algorithm"   # 작업자 프로세스(spawn 포함)도 같은 이름으로 import → pickle된 함수 복원 가능
+SUBMODULES = ("algorithm", "registry")
+
+def load_module(path=ALGORITHM_FILE):
+    # 알고리즘 모듈은 프로세스당 하나 — 이미 다른 파일로 로드됐으면 캐시를 조용히 돌려주지 않고 오류
+    # (다시 로드하면 실행 중인 작업자/pickle된 함수가 가리키는 모듈과 어긋나므로 reload는 하지 않음)
+    path = os.path.abspath(path)
+    module = sys.modules.get(MODULE_NAME)
+    if module is not None:
+        if module.ALGORITHM_FILE != path:
+            raise ValueError(f"{MODULE_NAME}은(는) 이미 {module.ALGORITHM_FILE}로 로드되어 {path}를 로드할 수 없습니다. (새 프로세스에서 실행하세요)")
+        return module
+    if path != ALGORITHM_FILE: os.environ["OPF_ALGORITHM_FILE"] = path
+    else: os.environ.pop("OPF_ALGORITHM_FILE", None)
+    return importlib.import_module(MODULE_NAME)
+
+def __getattr__(name):
+    if name in SUBMODULES: return importlib.import_module(f"{__name__}.{name}")
+    return getattr(load_module(), name)
@@ -0,0 +1,11 @@
+# 3.OPF_Algorithm_Finale.py를 이 모듈(opf_planner.algorithm)의 내용으로 실행하는 얇은 래퍼
+# 함수의 소속 모듈이 import 가능한 이름이 되므로, spawn 방식(Windows/macOS 기본) 작업자 프로세스도
+# pickle된 solver/작업 함수를 다시 import해 찾을 수 있음
+# 다른 위치의 알고리즘 파일은 환경변수 OPF_ALGORITHM_FILE로 지정 (작업자 프로세스에도 그대로 전달됨)
+import os
+
+ALGORITHM_FILE = os.path.abspath(os.environ.get("OPF_ALGORITHM_FILE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3.OPF_Algorithm_Finale.py"))   # load_module()이 로드된 파일 확인에 사용
+
+with open(ALGORITHM_FILE, 'r', encoding='utf-8') as _f:
+    exec(compile(_f.read(), ALGORITHM_FILE, 'exec'))
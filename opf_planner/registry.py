@@ -0,0 +1,146 @@
+# 교량 목록 레지스트리: 최종 입력 CSV(예: Final_Bridge_Data.csv) 옆에 열 단위 바이너리 스냅샷을 두고 공유
+#   <csv>.registry.npy  : NumPy 구조화 배열 (CSV 각 열 + 행별 좌표 버전 열 '_version')
+#   <csv>.registry.json : 스냅샷을 만든 CSV의 수정시각/크기, 열 구성
+# - 스냅샷은 메모리 맵으로 열어 숫자 열(위도/경도 등)은 복사 없이 DataFrame으로 감쌈 → 인코딩 재시도/재파싱 없음
+# - 위치 보정(2.OPF_Visualization.py)은 update_location()으로 해당 행만 제자리 수정하고 그 행의 버전만 올림
+# - CSV를 직접 고친 경우엔 다시 파싱하되, 좌표가 그대로인 교량은 이전 버전을 이어받음
+#   → 경로 캐시 등 파생 데이터는 버전이 바뀐 교량만 무효화하면 됨 (moved_since)
+import json
+import os
+
+CSV_ENCODINGS = ('utf-8-sig', 'cp949')   # 순서대로 시도 (utf-8-sig는 BOM 없는 utf-8도 읽음)
+SNAPSHOT_SUFFIX = ".registry.npy"
+META_SUFFIX = ".registry.json"
+VERSION_FIELD = "_version"
+COORD_FIELDS = ('longitude', 'latitude')
+
+def read_csv(path, **kwargs):
+    # 엑셀에서 만든 CSV(cp949)와 저장된 CSV(utf-8-sig)를 모두 읽기
+    import pandas as pd
+    for encoding in CSV_ENCODINGS[:-1]:
+        try: return pd.read_csv(path, encoding=encoding, **kwargs)
+        except UnicodeDecodeError: pass
+    return pd.read_csv(path, encoding=CSV_ENCODINGS[-1], **kwargs)
+
+def _stamp(csv_file):
+    st = os.stat(csv_file)
+    return [st.st_mtime_ns, st.st_size]
+
+def _row_keys(ids, n):
+    # 교량 key: ID 열 문자열 (ID 열이 없으면 행 번호) — 위치 보정 화면의 마커 id와 동일
+    return ids.astype(str).tolist() if ids is not None else [str(i) for i in range(n)]
+
+class BridgeRegistry:
+    def __init__(self, csv_file, rows, meta):
+        self.csv_file = csv_file
+        self.rows = rows             # 구조화 배열 (읽기 전용 메모리 맵)
+        self.meta = meta
+        self.keys = _row_keys(rows['ID'] if 'ID' in rows.dtype.names else None, len(rows))
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    def frame(self):
+        # 숫자 열은 메모리 맵 뷰 그대로, 문자열 열만 변환 (빈 문자열 → NaN, read_csv와 동일)
+        import numpy as np
+        import pandas as pd
+        data = {}
+        for name in self.meta['columns']:
+            col = self.rows[name]
+            if col.dtype.kind == 'U': data[name] = pd.Series(col.tolist()).replace('', np.nan)
+            else: data[name] = col
+        return pd.DataFrame(data, copy=False)
+
+    def version(self, key):
+        i = self.index.get(str(key))
+        return None if i is None else int(self.rows[VERSION_FIELD][i])
+
+    def versions(self):
+        return dict(zip(self.keys, self.rows[VERSION_FIELD].tolist()))
+
+    def coord(self, key):
+        # 알고리즘에서 쓰는 "경도,위도" 문자열
+        row = self.rows[self.index[str(key)]]
+        return f"{row['longitude']},{row['latitude']}"
+
+    def moved_since(self, seen):
+        # seen: {key: 이전에 본 버전} → 그 뒤 좌표가 바뀐(또는 삭제된) 교량 key 목록
+        return [key for key, v in seen.items() if self.version(key) != v]
+
+    def update_location(self, key, latitude, longitude):
+        # 위치 보정: 스냅샷의 해당 행만 제자리 수정(+버전 증가) 후 CSV 저장 → 스냅샷 기준 정보도 새 CSV로 갱신
+        import numpy as np
+        i = self.index.get(str(key))
+        if i is None: return False
+        rows = np.load(self.csv_file + SNAPSHOT_SUFFIX, mmap_mode='r+')
+        if (rows['latitude'][i], rows['longitude'][i]) != (latitude, longitude):
+            rows['latitude'][i], rows['longitude'][i] = latitude, longitude
+            rows[VERSION_FIELD][i] += 1
+            rows.flush()
+        self.rows = rows
+        self.frame().to_csv(self.csv_file, index=False, encoding='utf-8-sig')
+        self.meta['stamp'] = _stamp(self.csv_file)
+        _write_meta(self.csv_file, self.meta)
+        return True
+
+def _to_structured(df, versions):
+    import numpy as np
+    fields = []
+    for name in df.columns:
+        col = df[name]
+        if col.dtype.kind in 'biuf': fields.append((name, col.to_numpy().dtype))
+        else:
+            width = max([len(str(v)) for v in col.dropna()] + [1])
+            fields.append((name, f'U{width}'))
+    rows = np.zeros(len(df), dtype=fields + [(VERSION_FIELD, 'i8')])
+    for name, dtype in fields:
+        col = df[name]
+        rows[name] = col.fillna('').astype(str).to_numpy() if str(dtype).startswith('U') else col.to_numpy()
+    rows[VERSION_FIELD] = versions
+    return rows
+
+def _write_meta(csv_file, meta):
+    tmp = csv_file + META_SUFFIX + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, csv_file + META_SUFFIX)
+
+def _read_snapshot(csv_file):
+    import numpy as np
+    try:
+        with open(csv_file + META_SUFFIX, 'r', encoding='utf-8') as f: meta = json.load(f)
+        return np.load(csv_file + SNAPSHOT_SUFFIX, mmap_mode='r'), meta
+    except (OSError, ValueError): return None, None
+
+def rebuild(csv_file, previous=None):
+    # CSV 재파싱 → 이전 스냅샷과 key별로 좌표를 비교해 버전 이어받기 (바뀌었으면 +1, 새 교량은 0)
+    import numpy as np
+    df = read_csv(csv_file)
+    stamp = _stamp(csv_file)
+    old = BridgeRegistry(csv_file, *previous) if previous and previous[0] is not None else None
+    keys = _row_keys(df['ID'].to_numpy() if 'ID' in df.columns else None, len(df))
+    coords = [df[c].to_numpy(dtype=float) if c in df.columns else np.full(len(df), np.nan) for c in COORD_FIELDS]
+    versions = np.zeros(len(df), dtype='i8')
+    for i, key in enumerate(keys):
+        j = old.index.get(key) if old else None
+        if j is None: continue
+        prev = old.rows[j]
+        same = all(prev[c] == coords[k][i] or (np.isnan(prev[c]) and np.isnan(coords[k][i]))
+                   for k, c in enumerate(COORD_FIELDS) if c in prev.dtype.names)
+        versions[i] = prev[VERSION_FIELD] + (0 if same else 1)
+    rows = _to_structured(df, versions)
+    meta = {'stamp': stamp, 'columns': list(df.columns)}
+    try:
+        with open(csv_file + SNAPSHOT_SUFFIX + '.tmp', 'wb') as f: np.save(f, rows)
+        os.replace(csv_file + SNAPSHOT_SUFFIX + '.tmp', csv_file + SNAPSHOT_SUFFIX)
+        _write_meta(csv_file, meta)
+    except OSError: return BridgeRegistry(csv_file, rows, meta)   # 쓰기 불가(읽기 전용 폴더 등) → 메모리에서만 사용
+    return BridgeRegistry(csv_file, *_read_snapshot(csv_file))
+
+def load(csv_file):
+    # CSV가 스냅샷을 만든 뒤 바뀌지 않았으면 스냅샷을 그대로 메모리 맵, 아니면 재파싱 (CSV 없음/읽기 실패 → None)
+    try: stamp = _stamp(csv_file)
+    except OSError: return None
+    rows, meta = _read_snapshot(csv_file)
+    if rows is not None and meta.get('stamp') == stamp: return BridgeRegistry(csv_file, rows, meta)
+    # 읽기 실패(파일/인코딩/CSV 형식)만 None — 열 누락 등 그 밖의 오류는 그대로 올려 드러나게 함
+    import pandas as pd
+    try: return rebuild(csv_file, (rows, meta))
+    except (OSError, UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError): return None